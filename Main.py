@@ -1,12 +1,81 @@
 import re
-import json
+import time
+import asyncio
+import logging
 import urllib.parse
-from logger import setup_logger
+from logger import setup_logger, log_event, log_limited
+from scraper.profile_cache import ProfileCache
+from scraper.readiness import wait_until_ready, wait_for_more, ready_stats
+from scraper.extractors import VIDEO_EXTRACTOR_JS, PROFILE_EXTRACTOR_JS
+from scraper.pageless import fetch_rehydration_raw
+from scraper.decode import loads, decode_video_item, decode_user_info
+from scraper.routes import route_stats
+from scraper.journal import CrawlJournal
+from scraper.seen_index import SeenIndex
+from scraper.grid import load_grid, report_grid_rate
+from scraper.feed import FeedHarvester, is_complete
+from scraper.page_pool import lease_page, get_page_pool
+from scraper.metrics import metrics, span, start_metrics_server
+from scraper.adaptive import AdaptiveLimiter, fetch_timer
 
 logger = setup_logger()
 
 
 TEST_MAX_RESULTS = None  # zet op None om uit te zetten
+CONCURRENCY = 1  # aantal videos/profielen tegelijk (1 = oude sequentiele flow)
+REORDER_AHEAD = 8  # max zoveel x CONCURRENCY klare records bufferen achter een traag item
+GRID_LOADER = "mutation"  # "mutation" of "legacy" (oude scroll loop)
+HARVEST_FEED = False  # True = video stats uit de search feed responses, videopagina alleen als fallback
+
+PROFILE_CACHE_PATH = "cache/profiles.jsonl"  # None = alleen in-memory cache (append-only log)
+PROFILE_CACHE_TTL = 7 * 24 * 3600  # seconden
+
+profile_cache = ProfileCache(PROFILE_CACHE_PATH, ttl=PROFILE_CACHE_TTL)
+
+PAGELESS_FETCH = False  # True = eerst HTML via context.request, tab alleen als fallback
+
+PAGE_POOL_SIZE = 4  # min. open detail tabs per context (groeit mee met de concurrency); None = nieuwe tab per video/profiel
+PAGE_MAX_USES = 50  # tab wordt vervangen na zoveel keer gebruik
+
+BASE_URL = "https://www.tiktok.com"  # bv. http://127.0.0.1:8765 voor de lokale stand-in (benchmarks/)
+
+ADAPTIVE_CONCURRENCY = False  # True = AIMD limiter, CONCURRENCY is dan de startwaarde
+ADAPTIVE_MAX = 8  # bovengrens voor de adaptive limiter
+
+METRICS_PORT = None  # bv. 9464 = Prometheus endpoint op http://127.0.0.1:9464/metrics
+
+JOURNAL_PATH = "cache/crawl.sqlite"  # None = geen checkpoints / resume
+RESUME_WRITE_DONE = True  # bij resume ook de al afgeronde records naar de (nieuwe) sink; False = zelfde bestand
+
+_journal = None
+
+
+def get_journal():
+    global _journal
+    if _journal is None and JOURNAL_PATH:
+        _journal = CrawlJournal(JOURNAL_PATH)
+    return _journal
+
+
+SEEN_INDEX_PATH = None  # None = tijdelijke SQLite voor alleen deze run, anders blijvend (bv. "cache/seen.sqlite")
+SEEN_INDEX_MAX_AGE = 24 * 3600  # seconden; oudere records in een blijvende index worden opnieuw opgehaald
+
+_seen_index = None
+
+
+def get_seen_index():
+    global _seen_index
+    if _seen_index is None:
+        _seen_index = SeenIndex(SEEN_INDEX_PATH, max_age=SEEN_INDEX_MAX_AGE)
+    return _seen_index
+
+
+def reserve_pages(context, pages):
+    # de page pool moet minstens zoveel tabs hebben als er fetches tegelijk
+    # lopen, anders begrenst PAGE_POOL_SIZE stilletjes CONCURRENCY /
+    # ADAPTIVE_MAX / max_inflight en telt de wachttijd mee als latency
+    if PAGE_POOL_SIZE:
+        get_page_pool(context, max(PAGE_POOL_SIZE, pages), PAGE_MAX_USES)
 
 VIDEOS_TAB_SELECTOR = (
     "button[data-testid='tux-web-tab-bar'] span:has-text(\"Video's\"), "
@@ -30,74 +99,42 @@ def extract_hashtags(text: str):
 # -----------------------------
 # Bio links + bio text
 # -----------------------------
-async def extract_bio_links(page):
-    try:
-        container = page.locator("div.css-8ak5ua-7937d88b--DivShareLinks")
-        if await container.count() == 0:
-            return []
-
-        anchors = container.locator("a[data-e2e='user-link']")
-        out = []
-
-        for i in range(await anchors.count()):
-            href = await anchors.nth(i).get_attribute("href")
-            if not href:
-                continue
-
-            if "target=" in href:
-                try:
-                    parsed = urllib.parse.urlparse(href)
-                    qs = urllib.parse.parse_qs(parsed.query)
-                    href = urllib.parse.unquote(qs.get("target", [href])[0])
-                except:
-                    pass
-
-            out.append(href)
-
-        return list(set(out))
-    except:
-        return []
-
-
-async def extract_profile_bio(page):
-    try:
-        bio_el = page.locator("h2[data-e2e='user-bio']")
-        if await bio_el.count() == 0:
-            return None
-        return (await bio_el.inner_text()).strip()
-    except:
-        return None
+def unwrap_bio_link(href):
+    # tiktok redirect links (.../link/v2?target=...) -> echte url
+    if "target=" in href:
+        try:
+            parsed = urllib.parse.urlparse(href)
+            qs = urllib.parse.parse_qs(parsed.query)
+            href = urllib.parse.unquote(qs.get("target", [href])[0])
+        except:
+            pass
+    return href
 
 
 # -----------------------------
 # Profile stats
 # -----------------------------
-async def extract_profile_stats(page):
-    try:
-        data = await page.evaluate("() => window.__UNIVERSAL_DATA__ || null")
+def _find_user_info(data):
+    scope = data.get("__DEFAULT_SCOPE__", {})
 
-        if not data:
-            raw = await page.evaluate(
-                "() => document.querySelector('#__UNIVERSAL_DATA_FOR_REHYDRATION__')?.textContent || null"
-            )
-            if raw:
-                data = json.loads(raw)
+    user_block = None
+    for k, v in scope.items():
+        if "user" in k.lower():
+            user_block = v
+            break
 
-        if not data:
-            return {}
+    if not user_block:
+        return None
 
-        scope = data.get("__DEFAULT_SCOPE__", {})
+    return user_block.get("userInfo") or {}
 
-        user_block = None
-        for k, v in scope.items():
-            if "user" in k.lower():
-                user_block = v
-                break
 
-        if not user_block:
+def parse_profile_stats(data):
+    try:
+        user_info = _find_user_info(data)
+        if user_info is None:
             return {}
 
-        user_info = user_block.get("userInfo") or {}
         stats = user_info.get("stats") or {}
         user = user_info.get("user") or {}
 
@@ -113,41 +150,69 @@ async def extract_profile_stats(page):
         return {}
 
 
+def parse_profile_from_rehydration(data):
+    # zelfde vorm als extract_profile, maar dan uit de JSON i.p.v. de DOM
+    try:
+        user_info = _find_user_info(data)
+        if not user_info:
+            return None
+
+        user = user_info.get("user") or {}
+        link = (user.get("bioLink") or {}).get("link")
+
+        return {
+            "profile_bio": (user.get("signature") or "").strip() or None,
+            "bio_links": [unwrap_bio_link(link)] if link else [],
+            "profile_stats": parse_profile_stats(data),
+        }
+    except:
+        return None
+
+
 # -----------------------------
 # Video parsing helpers
 # -----------------------------
 
 
+def _is_full_item(obj):
+    return "id" in obj and "desc" in obj and "video" in obj and "stats" in obj
+
+
+def build_item_index(obj):
+    # één iteratieve (pre-order) wandeling door de boom:
+    # id -> eerste itemStruct met die id + de eerste volledige itemStruct.
+    # De stack bevat iterators, zo hoeven kinderen niet gekopieerd/omgedraaid te worden.
+    index = {}
+    first_full = None
+    stack = [iter((obj,))]
+
+    while stack:
+        for cur in stack[-1]:
+            t = type(cur)
+            if t is dict:
+                if "stats" in cur:
+                    item_id = cur.get("id")
+                    if item_id is not None and item_id not in index:
+                        index[item_id] = cur
+                    if first_full is None and _is_full_item(cur):
+                        first_full = cur
+                stack.append(iter(cur.values()))
+                break
+            elif t is list:
+                stack.append(iter(cur))
+                break
+        else:
+            stack.pop()
+
+    return index, first_full
+
+
 def _find_item_struct(obj):
-    if isinstance(obj, dict):
-        if {"id", "desc", "video", "stats"} <= set(obj.keys()):
-            return obj
-        for v in obj.values():
-            found = _find_item_struct(v)
-            if found:
-                return found
-    elif isinstance(obj, list):
-        for it in obj:
-            found = _find_item_struct(it)
-            if found:
-                return found
-    return None
+    return build_item_index(obj)[1]
 
 
 def _find_item_struct_by_id(obj, target_id: str):
-    if isinstance(obj, dict):
-        if obj.get("id") == str(target_id) and "stats" in obj:
-            return obj
-        for v in obj.values():
-            found = _find_item_struct_by_id(v, target_id)
-            if found:
-                return found
-    elif isinstance(obj, list):
-        for it in obj:
-            found = _find_item_struct_by_id(it, target_id)
-            if found:
-                return found
-    return None
+    return build_item_index(obj)[0].get(str(target_id))
 
 
 # -----------------------------
@@ -186,7 +251,8 @@ def parse_from_universal_data(data):
 def parse_video_from_rehydration(data, target_id=None):
     try:
         scope = data.get("__DEFAULT_SCOPE__", {})
-        item = _find_item_struct_by_id(scope, target_id) or _find_item_struct(scope)
+        index, first_full = build_item_index(scope)
+        item = index.get(str(target_id)) or first_full
 
         if not item:
             return None
@@ -218,43 +284,90 @@ def strip_hashtags(text: str):
 
 
 # -----------------------------
-# DOM video description
+# In-page extractor results
 # -----------------------------
-async def extract_video_description(page):
+def _wrap_video_item(item):
+    return {"__DEFAULT_SCOPE__": {"webapp.video-detail": {"itemInfo": {"itemStruct": item}}}}
+
+
+def _wrap_user_info(user_info):
+    return {"__DEFAULT_SCOPE__": {"webapp.user-detail": {"userInfo": user_info}}}
+
+
+def parse_extracted_video(extracted, target_id=None):
+    item = (extracted or {}).get("item")
+    if not item:
+        return None
+
+    # projectie terug in de vorm die de bestaande parsers verwachten
+    data = _wrap_video_item(item)
+    if extracted.get("source") == "universal":
+        return parse_from_universal_data(data)
+    return parse_video_from_rehydration(data, target_id)
+
+
+async def extract_profile(page):
     try:
-        el = page.locator("div[data-e2e='browse-video-desc']")
-        if await el.count() == 0:
-            return None
-        return (await el.inner_text()).strip()
+        extracted = await page.evaluate(PROFILE_EXTRACTOR_JS)
     except:
-        return None
+        return {"profile_bio": None, "bio_links": [], "profile_stats": {}}
+
+    return {
+        "profile_bio": extracted.get("bio"),
+        "bio_links": extracted.get("bioLinks") or [],
+        "profile_stats": extracted.get("stats") or {},
+    }
 
 
 # -----------------------------
 # Fetch video stats
 # -----------------------------
-async def fetch_video_stats(context, url, fallback_id=None):
-    page = await context.new_page()
+async def fetch_video_stats_pageless(context, url, fallback_id=None):
+    with span("video.fetch"):
+        raw = await fetch_rehydration_raw(context, url)
+    if not raw:
+        return None
+    metrics.page("video", "pageless")
+
+    # eerst typed decode van alleen de benodigde velden, anders volledige JSON
+    with span("video.json_parse"):
+        item = decode_video_item(raw)
+    if item:
+        with span("video.parse"):
+            return parse_from_universal_data(_wrap_video_item(item))
+
     try:
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(5000)
+        with span("video.json_parse"):
+            data = loads(raw)
+    except ValueError:
+        return None
+    with span("video.parse"):
+        return parse_from_universal_data(data) or parse_video_from_rehydration(data, fallback_id)
 
-        dom_desc = await extract_video_description(page)
 
-        data = await page.evaluate("() => window.__UNIVERSAL_DATA__ || null")
-        parsed = parse_from_universal_data(data) if data else None
+async def fetch_video_stats(context, url, fallback_id=None):
+    if PAGELESS_FETCH:
+        with fetch_timer():
+            parsed = await fetch_video_stats_pageless(context, url, fallback_id)
         if parsed:
-            parsed["description"] = parsed.get("description") or dom_desc
             return parsed
 
-        raw = await page.evaluate(
-            "() => document.querySelector('#__UNIVERSAL_DATA_FOR_REHYDRATION__')?.textContent || null"
-        )
-        if raw:
-            parsed = parse_video_from_rehydration(json.loads(raw), fallback_id)
-            if parsed:
-                parsed["description"] = parsed.get("description") or dom_desc
-                return parsed
+    async with lease_page(context, "video", PAGE_POOL_SIZE, PAGE_MAX_USES) as page:
+        with span("video.goto"):
+            await page.goto(url, timeout=60000)
+        metrics.page("video")
+        with span("video.readiness"):
+            await wait_until_ready(page, "video")
+
+        with span("video.evaluate"):
+            extracted = await page.evaluate(VIDEO_EXTRACTOR_JS, fallback_id)
+        dom_desc = extracted.get("domDesc")
+
+        with span("video.parse"):
+            parsed = parse_extracted_video(extracted, fallback_id)
+        if parsed:
+            parsed["description"] = parsed.get("description") or dom_desc
+            return parsed
 
         return {
             "video_id": fallback_id,
@@ -264,8 +377,6 @@ async def fetch_video_stats(context, url, fallback_id=None):
             "duration": None,
             "stats": {}
         }
-    finally:
-        await page.close()
 
 
 # -----------------------------
@@ -274,13 +385,20 @@ async def fetch_video_stats(context, url, fallback_id=None):
 async def scroll_until_all_videos_loaded(page, max_videos=500):
     await page.wait_for_selector(VIDEO_LIST_SELECTOR, timeout=10000)
 
-    last = 0
+    if GRID_LOADER == "mutation":
+        return len(await load_grid(page, VIDEO_LIST_SELECTOR, max_videos))
+    return await scroll_until_all_videos_loaded_legacy(page, max_videos)
+
+
+async def scroll_until_all_videos_loaded_legacy(page, max_videos=500):
+    t0 = time.perf_counter()
+    last = await page.locator(VIDEO_LIST_SELECTOR).count()
     stable = 0
     round_i = 0
 
     while True:
         await page.evaluate("window.scrollBy(0, window.innerHeight)")
-        await page.wait_for_timeout(1500)
+        await wait_for_more(page, VIDEO_LIST_SELECTOR, last)
 
         round_i += 1
         if round_i % 2 == 0:
@@ -291,7 +409,7 @@ async def scroll_until_all_videos_loaded(page, max_videos=500):
                 pass
 
         count = await page.locator(VIDEO_LIST_SELECTOR).count()
-        print("[SCROLL] videos:", count)
+        log_limited(logger, "scroll", "SCROLL_PROGRESS", logging.DEBUG, loader="legacy", cards=count)
 
         if count >= max_videos:
             break
@@ -305,6 +423,10 @@ async def scroll_until_all_videos_loaded(page, max_videos=500):
         if stable >= 5:
             break
 
+    reason = "max_videos" if count >= max_videos else "idle"
+    report_grid_rate("legacy", count, time.perf_counter() - t0, round_i, reason)
+    return count
+
 
 # -----------------------------
 # Build video list
@@ -321,15 +443,20 @@ async def build_video_items_from_video_tab(page, max_videos=None):
     }
     """, max_videos)
 
+    return video_items_from_cards(raw)
+
+
+def video_items_from_cards(raw, max_videos=None, seen=None):
+    # seen: optionele set die over meerdere batches gedeeld wordt
     out = []
-    seen = set()
+    seen = set() if seen is None else seen
 
-    for it in raw:
+    for it in raw[:max_videos] if max_videos else raw:
         href = it["href"]
         if not href:
             continue
         if href.startswith("/"):
-            href = "https://www.tiktok.com" + href
+            href = BASE_URL + href
 
         vid = href.split("/video/")[1].split("?")[0]
         if vid in seen:
@@ -346,79 +473,393 @@ async def build_video_items_from_video_tab(page, max_videos=None):
             "username": user
         })
 
-    print("[INFO] unique videos:", len(out))
     return out
 
 
 # -----------------------------
-# MAIN
+# Fetch profile
 # -----------------------------
-async def search_keyword(search_page, keyword, max_videos=None, max_profiles=None):
+async def fetch_profile_pageless(context, username):
+    with span("profile.fetch"):
+        raw = await fetch_rehydration_raw(context, f"{BASE_URL}/@{username}")
+    if not raw:
+        return None
+    metrics.page("profile", "pageless")
+
+    with span("profile.json_parse"):
+        user_info = decode_user_info(raw)
+    if user_info:
+        data = _wrap_user_info(user_info)
+    else:
+        try:
+            with span("profile.json_parse"):
+                data = loads(raw)
+        except ValueError:
+            return None
 
-    context = search_page.context
+    with span("profile.parse"):
+        profile = parse_profile_from_rehydration(data)
+    if not profile or not profile["profile_stats"]:
+        return None
+    return profile
 
-    await search_page.goto(f"https://www.tiktok.com/search?q={keyword}")
-    await search_page.wait_for_timeout(3000)
 
-    await search_page.locator(VIDEOS_TAB_SELECTOR).first.click()
-    await scroll_until_all_videos_loaded(search_page, max_videos or 200)
+async def fetch_profile(context, username):
+    if PAGELESS_FETCH:
+        with fetch_timer():
+            profile = await fetch_profile_pageless(context, username)
+        if profile:
+            return profile
 
-    video_items = await build_video_items_from_video_tab(search_page, max_videos)
+    async with lease_page(context, "profile", PAGE_POOL_SIZE, PAGE_MAX_USES) as profile_page:
+        with span("profile.goto"):
+            await profile_page.goto(f"{BASE_URL}/@{username}", timeout=60000)
+        metrics.page("profile")
+        with span("profile.readiness"):
+            await wait_until_ready(profile_page, "profile")
 
-    results = []
+        with span("profile.extract"):
+            return await extract_profile(profile_page)
 
-    for i, item in enumerate(video_items):
-        if TEST_MAX_RESULTS and i >= TEST_MAX_RESULTS:
-            break
 
+# -----------------------------
+# Per video: stats + profiel
+# -----------------------------
+async def process_video_item(context, keyword, item, cache=None):
+    if not item["username"]:
+        return None
+
+    # run-brede dedup: een video die al bij een ander keyword is opgehaald
+    # wordt niet opnieuw bezocht, alleen de keyword/positie wordt vastgelegd
+    index = get_seen_index()
+    index.add_match(item["video_id"], keyword, item["idx"])
+
+    record, reused = await index.get_or_fetch(
+        item["video_id"], lambda: fetch_video_record(context, keyword, item, cache)
+    )
+    if record and reused:
+        record = {**record, "keyword": keyword}
+    return record
+
+
+async def fetch_item_video_data(context, item):
+    video_data = item.get("harvested")
+    if not is_complete(video_data):
         video_data = await fetch_video_stats(context, item["href"], item["video_id"])
+    return video_data
+
+
+async def fetch_item_profile(context, item, cache=None):
+    cache = cache or profile_cache
+    return await cache.get_or_fetch(
+        item["username"], lambda username: fetch_profile(context, username)
+    )
+
+
+async def fetch_video_record(context, keyword, item, cache=None):
+    video_data = await fetch_item_video_data(context, item)
+    profile = await fetch_item_profile(context, item, cache)
+    return build_record(keyword, item, video_data, profile)
+
+
+def build_record(keyword, item, video_data, profile):
+    profile_bio = profile.get("profile_bio")
+    bio_links = profile.get("bio_links") or []
+    profile_stats = profile.get("profile_stats") or {}
+
+    # -----------------------------
+    # DESCRIPTION + HASHTAGS SPLIT
+    # -----------------------------
+    raw_desc = video_data.get("description") or item.get("desc") or ""
+
+    # hashtags: eerst JSON, anders fallback regex
+    json_hashtags = video_data.get("hashtags") or []
+    final_hashtags = json_hashtags if json_hashtags else extract_hashtags(raw_desc)
+
+    # description opschonen (hashtags eruit)
+    clean_desc = strip_hashtags(raw_desc)
+
+    return {
+        "keyword": keyword,
+        "video_id": video_data.get("video_id"),
+        "video_url": item["href"],
+        "desc": clean_desc,
+        "views": video_data.get("stats", {}).get("views"),
+        "likes": video_data.get("stats", {}).get("likes"),
+        "comments": video_data.get("stats", {}).get("comments"),
+        "shares": video_data.get("stats", {}).get("shares"),
+        "saves": video_data.get("stats", {}).get("saves"),
+        "author": item["username"],
+        "profile_bio": profile_bio,
+        "bio_links": bio_links,
+        "profile_stats": profile_stats,
+        "hashtags": final_hashtags,
+        "create_time": video_data.get("create_time"),
+        "duration": video_data.get("duration"),
+    }
 
-        bio_links = []
-        profile_stats = {}
-        profile_bio = None
 
-        if item["username"]:
-            profile_page = await context.new_page()
-            try:
-                await profile_page.goto(f"https://www.tiktok.com/@{item['username']}", timeout=60000)
-                await profile_page.wait_for_timeout(3500)
-
-                profile_bio = await extract_profile_bio(profile_page)
-                bio_links = await extract_bio_links(profile_page)
-                profile_stats = await extract_profile_stats(profile_page)
-            finally:
-                await profile_page.close()
-
-            # -----------------------------
-            # DESCRIPTION + HASHTAGS SPLIT
-            # -----------------------------
-            raw_desc = video_data.get("description") or item.get("desc") or ""
-
-            # hashtags: eerst JSON, anders fallback regex
-            json_hashtags = video_data.get("hashtags") or []
-            final_hashtags = json_hashtags if json_hashtags else extract_hashtags(raw_desc)
-
-            # description opschonen (hashtags eruit)
-            clean_desc = strip_hashtags(raw_desc)
-
-            results.append({
-                "keyword": keyword,
-                "video_id": video_data.get("video_id"),
-                "video_url": item["href"],
-                "desc": clean_desc,
-                "views": video_data.get("stats", {}).get("views"),
-                "likes": video_data.get("stats", {}).get("likes"),
-                "comments": video_data.get("stats", {}).get("comments"),
-                "shares": video_data.get("stats", {}).get("shares"),
-                "saves": video_data.get("stats", {}).get("saves"),
-                "author": item["username"],
-                "profile_bio": profile_bio,
-                "bio_links": bio_links,
-                "profile_stats": profile_stats,
-                "hashtags": final_hashtags,
-                "create_time": video_data.get("create_time"),
-                "duration": video_data.get("duration"),
-            })
-
-    print("[DONE]", len(results))
-    return results
\ No newline at end of file
+# -----------------------------
+# Worker pool
+# -----------------------------
+async def iter_video_records(context, keyword, video_items, concurrency=1, cache=None, journal=None,
+                             limiter=None, done=None):
+    # max `concurrency` items tegelijk, elk in eigen tabs van dezelfde context.
+    # De pool blijft vol: zodra een item klaar is start het volgende, ook als
+    # een ouder item nog loopt. Klare records wachten in een reorder buffer en
+    # komen in idx volgorde naar buiten. Er lopen nooit meer dan
+    # `concurrency` taken en de buffer loopt max REORDER_AHEAD x concurrency
+    # items voor op het oudste openstaande item (geheugen blijft begrensd).
+    # limiter: optionele gedeelde semaphore (globaal budget over keywords heen)
+    # done: {video_id: record} uit een onderbroken run; die items worden niet
+    # opnieuw opgehaald maar gaan op hun idx plek de reorder buffer in
+    done = done or {}
+
+    async def worker(item):
+        t0 = time.perf_counter()
+        try:
+            if limiter:
+                async with limiter:
+                    record = await process_video_item(context, keyword, item, cache)
+                    if isinstance(limiter, AdaptiveLimiter) and record and record.get("views") is None:
+                        # stats: {} fallback -> telt mee als signaal om terug te schakelen
+                        limiter.mark_empty()
+            else:
+                record = await process_video_item(context, keyword, item, cache)
+        except Exception as e:
+            log_event(
+                logger, "VIDEO_ERROR", logging.ERROR,
+                keyword=keyword, video_id=item["video_id"], idx=item["idx"], stage="video", error=e,
+            )
+            if journal:
+                journal.mark_failed(keyword, item["video_id"], e)
+            return None
+
+        log_event(
+            logger, "VIDEO_DONE", logging.DEBUG,
+            keyword=keyword, video_id=item["video_id"], stage="record",
+            duration=round(time.perf_counter() - t0, 3),
+        )
+        if journal:
+            if record:
+                journal.mark_done(keyword, item["video_id"], record)
+            else:
+                journal.mark_failed(keyword, item["video_id"], "no record")
+        return record
+
+    size = max(1, concurrency)
+    reserve_pages(context, size)
+    running = {}   # task -> positie in video_items
+    finished = {}  # positie -> record (reorder buffer)
+    pending = enumerate(video_items)
+    next_pos = 0
+    started = 0
+
+    def fill():
+        nonlocal started
+        while len(running) < size and started - next_pos < size * REORDER_AHEAD:
+            nxt = next(pending, None)
+            if nxt is None:
+                return
+            pos, item = nxt
+            started += 1
+            if item["video_id"] in done:
+                finished[pos] = done[item["video_id"]]
+                continue
+            running[asyncio.ensure_future(worker(item))] = pos
+
+    fill()
+    try:
+        while running or finished:
+            if next_pos in finished:
+                record = finished.pop(next_pos)
+                next_pos += 1
+                fill()
+                if record:
+                    yield record
+                continue
+
+            completed, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in completed:
+                finished[running.pop(task)] = task.result()
+            fill()
+    finally:
+        for task in running:
+            task.cancel()
+
+
+# -----------------------------
+# Zoekpagina -> video_items
+# -----------------------------
+def parse_feed_item(item):
+    return parse_video_from_rehydration(_wrap_video_item(item), item.get("id"))
+
+
+async def discover_video_items(search_page, keyword, max_videos=None, on_items=None):
+    # on_items: optionele async callback die nieuwe video_items krijgt zodra
+    # ze in het grid verschijnen (i.p.v. pas na het scrollen)
+    harvester = FeedHarvester(parse_feed_item) if HARVEST_FEED else None
+    limit = TEST_MAX_RESULTS or max_videos
+    if TEST_MAX_RESULTS and max_videos:
+        limit = min(TEST_MAX_RESULTS, max_videos)
+
+    video_items = []
+    seen = set()
+
+    async def emit(new_items):
+        if limit:
+            new_items = new_items[:max(0, limit - len(video_items))]
+        if harvester:
+            for item in new_items:
+                harvested = harvester.get(item["video_id"])
+                if harvested:
+                    item["harvested"] = harvested
+        video_items.extend(new_items)
+        if on_items and new_items:
+            await on_items(new_items)
+
+    async def on_cards(cards):
+        await emit(video_items_from_cards(cards, seen=seen))
+
+    if harvester:
+        harvester.attach(search_page)
+
+    try:
+        await search_page.goto(f"{BASE_URL}/search?q={keyword}")
+        await wait_until_ready(search_page, "search")
+
+        await search_page.locator(VIDEOS_TAB_SELECTOR).first.click()
+
+        if GRID_LOADER == "mutation":
+            # kaarten worden tijdens het scrollen al in de pagina verzameld
+            await search_page.wait_for_selector(VIDEO_LIST_SELECTOR, timeout=10000)
+            await load_grid(search_page, VIDEO_LIST_SELECTOR, max_videos or 200, on_cards=on_cards)
+        else:
+            await scroll_until_all_videos_loaded(search_page, max_videos or 200)
+            await emit(await build_video_items_from_video_tab(search_page, max_videos))
+    finally:
+        if harvester:
+            harvester.detach()
+
+    video_items.sort(key=lambda it: it["idx"])
+    log_event(logger, "VIDEO_ITEMS", logging.INFO, keyword=keyword, unique=len(video_items))
+
+    if harvester:
+        logger.info(
+            f"FEED_COVERAGE | keyword={keyword} | items={len(video_items)} | "
+            f"complete={sum(1 for it in video_items if is_complete(it.get('harvested')))}"
+        )
+    return video_items
+
+
+def log_keyword_stats(keyword, count, elapsed, concurrency):
+    rate = count / elapsed * 60 if elapsed > 0 else 0.0
+    logger.info(
+        f"KEYWORD_THROUGHPUT | keyword={keyword} | results={count} | "
+        f"concurrency={concurrency} | duration={elapsed:.2f}s | rate={rate:.1f}/min | "
+        f"profile_hits={profile_cache.hits} | profile_misses={profile_cache.misses} | "
+        f"video_dedup_hits={get_seen_index().hits}"
+    )
+
+    for page_type, st in ready_stats.summary().items():
+        logger.info(
+            f"READY_STATS | page={page_type} | count={st['count']} | avg_ms={st['avg_ms']} | "
+            f"max_ms={st['max_ms']:.0f} | timeouts={st['timeouts']} | saved_ms={st['saved_ms']:.0f}"
+        )
+
+    routes = route_stats.summary()
+    logger.info(
+        f"ROUTE_STATS | keyword={keyword} | blocked={routes['blocked']} | allowed={routes['allowed']} | "
+        f"est_mb_saved={routes['est_mb_saved']} | by_type={routes['blocked_by_type']}"
+    )
+
+    m = metrics.summary()
+    for stage, st in sorted(m["stages"].items()):
+        logger.info(
+            f"STAGE_STATS | stage={stage} | count={st['count']} | avg_ms={st['avg_ms']} | "
+            f"max_ms={st['max_s'] * 1000:.0f} | total_s={st['total_s']:.1f}"
+        )
+    logger.info(
+        f"PAGE_STATS | pages={m['pages']} | pages_per_s={m['pages_per_s']} | mb={m['mb']} | errors={m['errors']}"
+    )
+
+
+def load_journal_state(journal, keyword, resume=None):
+    # -> (alle video_items of None = opnieuw zoeken, {video_id: record} al afgerond)
+    # resume None: alleen een onderbroken keyword hervatten, een afgerond keyword
+    #              opnieuw zoeken; True: altijd hervatten; False: altijd opnieuw
+    if not journal:
+        return None, {}
+    if resume is False or (resume is None and journal.is_complete(keyword)):
+        journal.reset(keyword)
+        return None, {}
+
+    video_items = journal.get_items(keyword)
+    if video_items is None:
+        return None, {}
+
+    done = journal.done_records(keyword)
+    logger.info(
+        f"KEYWORD_RESUME | keyword={keyword} | items={len(video_items)} | done={len(done)}"
+    )
+    return video_items, done
+
+
+# -----------------------------
+# MAIN
+# -----------------------------
+async def iter_keyword_results(search_page, keyword, max_videos=None, concurrency=None, sink=None, resume=None,
+                               limiter=None):
+    # async generator: elk record komt naar buiten (en in de sink) zodra het klaar is
+    context = search_page.context
+    concurrency = concurrency or CONCURRENCY
+    journal = get_journal()
+    start_metrics_server(METRICS_PORT)
+
+    adaptive = None
+    if ADAPTIVE_CONCURRENCY and limiter is None:
+        # window zo groot als de bovengrens, de limiter bepaalt hoeveel er echt lopen
+        adaptive = limiter = AdaptiveLimiter(initial=concurrency, max_limit=max(concurrency, ADAPTIVE_MAX))
+        concurrency = adaptive.max_limit
+
+    # resume: video_items uit het journal i.p.v. opnieuw zoeken + scrollen
+    video_items, done = load_journal_state(journal, keyword, resume)
+    if video_items is None:
+        video_items = await discover_video_items(search_page, keyword, max_videos)
+        if journal:
+            journal.save_items(keyword, video_items)
+
+    count = 0
+    t0 = time.perf_counter()
+    try:
+        # records uit de onderbroken run komen op hun idx plek mee en gaan ook
+        # naar de sink (nieuwe CSV per poging), tenzij RESUME_WRITE_DONE uit staat
+        async for record in iter_video_records(
+            context, keyword, video_items, concurrency, journal=journal, limiter=limiter, done=done
+        ):
+            replayed = done.get(record.get("video_id")) is record
+            if sink and (RESUME_WRITE_DONE or not replayed):
+                with span("write"):
+                    sink.write(record)
+            count += 1
+            yield record
+    finally:
+        profile_cache.flush()
+
+    if journal:
+        journal.mark_complete(keyword)
+    log_keyword_stats(keyword, count, time.perf_counter() - t0, concurrency)
+    if adaptive:
+        st = adaptive.summary()
+        logger.info(
+            f"ADAPTIVE_SUMMARY | keyword={keyword} | limit={st['limit']} | min={st['min']} | "
+            f"max={st['max']} | adjustments={st['adjustments']} | history={st['history']}"
+        )
+
+
+async def search_keyword(search_page, keyword, max_videos=None, max_profiles=None, concurrency=None, sink=None,
+                         resume=None):
+    return [
+        record
+        async for record in iter_keyword_results(search_page, keyword, max_videos, concurrency, sink, resume)
+    ]
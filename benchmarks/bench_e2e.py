@@ -0,0 +1,186 @@
+# End-to-end throughput van search_keyword tegen de lokale stand-in (geen
+# netwerk nodig). Per concurrency: results/s, p50/p95 latency per item en
+# piek RSS tijdens die run van Python + Playwright driver + browser processen
+# (psutil). Met --memory volgt per concurrency een aparte run onder
+# tracemalloc voor de Python piek; die run telt niet mee voor de timing.
+#
+#   python benchmarks/bench_e2e.py --concurrency 1 2 4 8 --results 60 --latency-ms 150
+#   python benchmarks/bench_e2e.py --pageless --memory --json bench_e2e.json
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tracemalloc
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright.async_api import async_playwright  # noqa: E402
+
+import scraper.search as search  # noqa: E402
+from scraper.browser import DESKTOP  # noqa: E402
+from scraper.profile_cache import ProfileCache  # noqa: E402
+from benchmarks.standin import StandinConfig, StandinServer  # noqa: E402
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def reset_state():
+    # elke run koud: geen profiel cache, journal, seen index of pool van een vorige run
+    search.profile_cache = ProfileCache(None, ttl=search.PROFILE_CACHE_TTL)
+    search.JOURNAL_PATH = None
+    search._journal = None
+    search.SEEN_INDEX_PATH = None
+    search._seen_index = None
+
+
+async def sample_rss(stop, interval=0.2):
+    # piek van de som van RSS over dit proces en alle kindprocessen (browser)
+    me = psutil.Process()
+    peak = 0
+    while True:
+        total = 0
+        for proc in [me, *me.children(recursive=True)]:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        peak = max(peak, total)
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+            return peak
+        except asyncio.TimeoutError:
+            pass
+
+
+async def traced_peak(coro):
+    # aparte geheugen run: tracemalloc vertraagt elke allocatie, dus niet timen
+    tracemalloc.start()
+    try:
+        await coro
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024 / 1024, 1)
+
+
+async def run_once(browser, keyword, concurrency, max_videos):
+    reset_state()
+    latencies = []
+    process_video_item = search.process_video_item
+
+    async def timed(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return await process_video_item(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - t0)
+
+    search.process_video_item = timed
+    context = await browser.new_context(**DESKTOP)
+    try:
+        page = await context.new_page()
+        stop = asyncio.Event()
+        sampler = asyncio.ensure_future(sample_rss(stop)) if psutil else None
+        t0 = time.perf_counter()
+        try:
+            results = await search.search_keyword(page, keyword, max_videos=max_videos, concurrency=concurrency)
+            elapsed = time.perf_counter() - t0
+        finally:
+            stop.set()
+            rss_peak = await sampler if sampler else None
+    finally:
+        search.process_video_item = process_video_item
+        await context.close()
+
+    empty = sum(1 for r in results if r.get("views") is None)
+    return {
+        "concurrency": concurrency,
+        "results": len(results),
+        "empty": empty,
+        "duration_s": round(elapsed, 2),
+        "results_per_s": round(len(results) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "rss_peak_mb": round(rss_peak / 1024 / 1024, 1) if rss_peak else None,
+    }
+
+
+async def run_memory(browser, keyword, concurrency, max_videos):
+    reset_state()
+    context = await browser.new_context(**DESKTOP)
+    try:
+        page = await context.new_page()
+        return await traced_peak(
+            search.search_keyword(page, keyword, max_videos=max_videos, concurrency=concurrency)
+        )
+    finally:
+        await context.close()
+
+
+async def main():
+    ap = argparse.ArgumentParser(description="Offline end-to-end benchmark van search_keyword")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--results", type=int, default=60, help="videos per keyword op de stand-in")
+    ap.add_argument("--latency-ms", type=float, default=100)
+    ap.add_argument("--jitter-ms", type=float, default=50)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--empty-rate", type=float, default=0.0)
+    ap.add_argument("--related", type=int, default=20)
+    ap.add_argument("--recorded", default=None)
+    ap.add_argument("--pageless", action="store_true", help="PAGELESS_FETCH aan")
+    ap.add_argument("--memory", action="store_true", help="extra tracemalloc run per concurrency (py_peak_mb)")
+    ap.add_argument("--json", default=None, help="schrijf resultaten naar dit bestand")
+    args = ap.parse_args()
+
+    config = StandinConfig(
+        results=args.results, related=args.related, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, empty_rate=args.empty_rate, recorded=args.recorded,
+    )
+    search.PAGELESS_FETCH = args.pageless
+    search.TEST_MAX_RESULTS = None
+
+    if psutil is None:
+        print("psutil niet geinstalleerd: rss_peak_mb wordt niet gemeten (pip install psutil)")
+
+    rows = []
+    with StandinServer(config) as server:
+        search.BASE_URL = server.url
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                for c in args.concurrency:
+                    row = await run_once(browser, f"bench{c}", c, args.results)
+                    if args.memory:
+                        row["py_peak_mb"] = await run_memory(browser, f"bench{c}", c, args.results)
+                    rows.append(row)
+                    print(
+                        f"concurrency={row['concurrency']:>3} | results={row['results']:>4} | "
+                        f"{row['results_per_s']:>6.2f}/s | p50={row['p50_ms']:>7.1f}ms | "
+                        f"p95={row['p95_ms']:>7.1f}ms | rss_peak={row['rss_peak_mb']}MB | "
+                        f"py_peak={row.get('py_peak_mb', '-')}MB"
+                    )
+            finally:
+                await browser.close()
+
+    if args.json:
+        out = {
+            "standin": {k: v for k, v in vars(args).items() if k not in ("json", "concurrency", "memory")},
+            "runs": rows,
+        }
+        Path(args.json).write_text(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
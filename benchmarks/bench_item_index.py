@@ -0,0 +1,88 @@
+# Vergelijkt de oude recursieve _find_item_struct* met build_item_index op
+# grote synthetische rehydration blobs (veel related videos, diepe nesting).
+#
+#   python benchmarks/bench_item_index.py
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper.search import build_item_index, parse_video_from_rehydration  # noqa: E402
+from benchmarks.fixtures import make_blob  # noqa: E402
+
+
+# -----------------------------
+# Oude implementatie (referentie)
+# -----------------------------
+def old_find_item_struct(obj):
+    if isinstance(obj, dict):
+        if {"id", "desc", "video", "stats"} <= set(obj.keys()):
+            return obj
+        for v in obj.values():
+            found = old_find_item_struct(v)
+            if found:
+                return found
+    elif isinstance(obj, list):
+        for it in obj:
+            found = old_find_item_struct(it)
+            if found:
+                return found
+    return None
+
+
+def old_find_item_struct_by_id(obj, target_id):
+    if isinstance(obj, dict):
+        if obj.get("id") == str(target_id) and "stats" in obj:
+            return obj
+        for v in obj.values():
+            found = old_find_item_struct_by_id(v, target_id)
+            if found:
+                return found
+    elif isinstance(obj, list):
+        for it in obj:
+            found = old_find_item_struct_by_id(it, target_id)
+            if found:
+                return found
+    return None
+
+
+def bench(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def lookup_all_indexed(scope, ids):
+    index, _ = build_item_index(scope)
+    return [index.get(i) for i in ids]
+
+
+def main():
+    print(f"{'related':>8} | {'old 1 lookup':>12} | {'index':>8} | {'old 50 lookups':>14} | {'index 50':>8}")
+    for n in (100, 1000, 5000, 20000):
+        blob = make_blob(n)
+        scope = blob["__DEFAULT_SCOPE__"]
+        target = str(7_000_000_000_000_000_000 + n)
+        ids = [str(7_000_000_000_000_000_000 + i) for i in range(0, n + 1, max(1, n // 50))]
+
+        # 1 lookup die mist -> oude code scant 2x (by_id + first full)
+        old_ms = bench(lambda: old_find_item_struct_by_id(scope, "missing") or old_find_item_struct(scope))
+        new_ms = bench(lambda: build_item_index(scope))
+
+        # meerdere embedded items: oud = volle scan per id, nieuw = 1 index + dict lookups
+        old_all_ms = bench(lambda: [old_find_item_struct_by_id(scope, i) for i in ids], repeat=1)
+        new_all_ms = bench(lambda: lookup_all_indexed(scope, ids), repeat=1)
+
+        index, _ = build_item_index(scope)
+        assert index[target] is old_find_item_struct_by_id(scope, target)
+        assert parse_video_from_rehydration(blob, target)["video_id"] == target
+
+        print(f"{n:>8} | {old_ms:>10.2f}ms | {new_ms:>6.2f}ms | {old_all_ms:>12.2f}ms | {new_all_ms:>6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# Micro-benchmarks van de pure parsers op de fixture corpus (benchmarks/fixtures.py):
+# ops/s en piek allocaties (tracemalloc) per parser per fixture. Met --json
+# worden de resultaten machine-leesbaar weggeschreven; met --compare wordt
+# een eerder resultaat (bv. van de vorige commit) ernaast gezet.
+#
+#   python benchmarks/bench_parsers.py --sizes 1 5 --json bench_parsers.json
+#   python benchmarks/bench_parsers.py --compare bench_parsers.json
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper import search  # noqa: E402
+from scraper import decode  # noqa: E402
+from scraper.decode import loads, decode_video_item, backend  # noqa: E402
+from scraper.pageless import extract_rehydration_raw  # noqa: E402
+from benchmarks.fixtures import (  # noqa: E402
+    DEFAULT_SIZES_MB, BASE_ID, build_corpus, make_item, make_profile_blob, to_html,
+)
+
+
+# -----------------------------
+# Parsers per fixture
+# -----------------------------
+def blob_cases(raw):
+    # (naam, functie) voor een rehydration blob; de JSON wordt vooraf 1x gedecodeerd
+    data = loads(raw)
+    scope = data["__DEFAULT_SCOPE__"]
+    html = to_html(raw)
+    missing = str(BASE_ID - 1)
+    # zonder msgspec geeft decode_video_item direct None terug: dat meten is zinloos
+    typed = decode_video_item if decode.msgspec is not None else None
+    return [
+        ("extract_rehydration_raw", lambda: extract_rehydration_raw(html)),
+        ("loads", lambda: loads(raw)),
+        ("decode_video_item", typed and (lambda: typed(raw))),
+        ("parse_from_universal_data", lambda: search.parse_from_universal_data(data)),
+        ("parse_video_from_rehydration", lambda: search.parse_video_from_rehydration(data, missing)),
+        ("_find_item_struct", lambda: search._find_item_struct(scope)),
+        ("_find_item_struct_by_id", lambda: search._find_item_struct_by_id(scope, missing)),
+    ]
+
+
+def text_cases(n=1000):
+    # kleine pure functies: 1 "op" = de hele lijst van n strings
+    descs = [make_item(i, desc_words=20)["desc"] for i in range(n)]
+    links = [
+        f"https://www.tiktok.com/link/v2?aid=1988&lang=nl&scene=bio_url&target=https%3A%2F%2Fexample.com%2F{i}"
+        if i % 2 else f"https://example.com/plain/{i}"
+        for i in range(n)
+    ]
+    return [
+        ("extract_hashtags", lambda: [search.extract_hashtags(d) for d in descs]),
+        ("strip_hashtags", lambda: [search.strip_hashtags(d) for d in descs]),
+        ("unwrap_bio_link", lambda: [search.unwrap_bio_link(u) for u in links]),
+    ]
+
+
+def profile_cases(raw):
+    data = loads(raw)
+    return [
+        ("loads", lambda: loads(raw)),
+        ("parse_profile_from_rehydration", lambda: search.parse_profile_from_rehydration(data)),
+    ]
+
+
+# -----------------------------
+# Meten
+# -----------------------------
+def measure(fn, min_time=0.3, min_runs=3):
+    times = []
+    start = time.perf_counter()
+    while len(times) < min_runs or time.perf_counter() - start < min_time:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    return {
+        "runs": len(times),
+        "best_ms": round(best * 1000, 3),
+        "mean_ms": round(sum(times) / len(times) * 1000, 3),
+        "ops_per_s": round(1 / best, 2) if best > 0 else None,
+        "alloc_peak_kb": round((peak - before) / 1024, 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(sizes_mb, recorded=None, only=None, min_time=0.3):
+    corpus = build_corpus(sizes_mb, recorded=recorded)
+    fixtures = [(name, round(len(raw) / 1024 / 1024, 2), blob_cases(raw)) for name, raw in corpus.items()]
+    profile = json.dumps(make_profile_blob()).encode("utf-8")
+    fixtures.append(("profile", round(len(profile) / 1024 / 1024, 2), profile_cases(profile)))
+    fixtures.append(("text", None, text_cases()))
+
+    results = []
+    for fixture, size_mb, cases in fixtures:
+        for parser, fn in cases:
+            if only and parser not in only:
+                continue
+            if fn is None:
+                print(f"{parser:<32} {fixture:<16} {'n/a':>12} (niet beschikbaar)")
+                continue
+            row = {"parser": parser, "fixture": fixture, "size_mb": size_mb, **measure(fn, min_time)}
+            results.append(row)
+            print(
+                f"{parser:<32} {fixture:<16} {row['ops_per_s']:>12.2f} ops/s "
+                f"{row['best_ms']:>10.3f} ms {row['alloc_peak_kb']:>12.1f} KB"
+            )
+    return results
+
+
+def compare(results, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text())
+    old = {(r["parser"], r["fixture"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline_path} (commit {baseline.get('commit')}):")
+    for r in results:
+        prev = old.get((r["parser"], r["fixture"]))
+        if not prev or not prev["ops_per_s"]:
+            continue
+        speed = r["ops_per_s"] / prev["ops_per_s"]
+        flag = "  <-- regressie" if speed < 0.9 else ""
+        print(f"{r['parser']:<32} {r['fixture']:<16} x{speed:.2f} ops/s{flag}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Parser micro-benchmarks")
+    ap.add_argument("--sizes", type=float, nargs="+", default=list(DEFAULT_SIZES_MB), help="blob groottes in MB")
+    ap.add_argument("--recorded", default=None, help="map met opgenomen .json/.html rehydration pagina's")
+    ap.add_argument("--only", nargs="+", default=None, help="alleen deze parsers")
+    ap.add_argument("--min-time", type=float, default=0.3, help="min. meettijd per parser/fixture (s)")
+    ap.add_argument("--json", default=None, help="schrijf resultaten naar dit bestand")
+    ap.add_argument("--compare", default=None, help="vergelijk met een eerder --json bestand")
+    args = ap.parse_args()
+
+    sizes = [int(s) if float(s).is_integer() else s for s in args.sizes]
+    results = run(sizes, args.recorded, args.only, args.min_time)
+
+    if args.compare:
+        compare(results, args.compare)
+
+    if args.json:
+        out = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "json_backend": backend(),
+            "created_at": int(time.time()),
+            "results": results,
+        }
+        Path(args.json).write_text(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
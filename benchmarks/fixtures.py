@@ -0,0 +1,134 @@
+# Fixture corpus voor de parser benchmarks: realistische rehydration blobs
+# (video-detail + related lijsten + diepe nesting + profiel) en een generator
+# die ze opschaalt naar een doelgrootte (1-50 MB). Opgenomen pagina's (.json
+# of .html met de rehydration script tag) kunnen uit een map geladen worden.
+import json
+from pathlib import Path
+
+BASE_ID = 7_000_000_000_000_000_000
+
+
+# -----------------------------
+# Items
+# -----------------------------
+def make_item(i, desc_words=12):
+    tags = [f"tag{(i + k) % 31}" for k in range(1 + i % 4)]
+    words = " ".join(f"woord{(i * 7 + k) % 997}" for k in range(desc_words))
+    return {
+        "id": str(BASE_ID + i),
+        "desc": f"video {i} {words} " + " ".join(f"#{t}" for t in tags),
+        "createTime": 1700000000 + i,
+        "video": {
+            "duration": 10 + i % 50,
+            "ratio": "720p",
+            "cover": f"https://p16-sign.tiktokcdn.com/obj/cover/{i}.jpeg?x-expires=1700000000&x-signature=abc",
+            "bitrateInfo": [
+                {"Bitrate": 300_000 * (j + 1), "CodecType": "h264", "PlayAddr": {"UrlList": [f"https://v16.cdn/{i}/{j}"]}}
+                for j in range(4)
+            ],
+        },
+        "author": {"uniqueId": f"user{i % 97}", "nickname": f"User {i}", "verified": i % 11 == 0},
+        "music": {"id": str(6_900_000_000 + i % 300), "title": f"original sound {i % 300}"},
+        "textExtra": [{"hashtagName": t, "type": 1, "start": 0, "end": len(t) + 1} for t in tags],
+        "stats": {"playCount": i * 10, "diggCount": i, "commentCount": i % 13, "shareCount": i % 5,
+                  "collectCount": i % 17},
+    }
+
+
+def make_user_info(username="user1"):
+    return {
+        "user": {
+            "uniqueId": username,
+            "nickname": username.title(),
+            "verified": False,
+            "signature": f"bio van {username} | links hieronder",
+            "bioLink": {"link": f"https://example.com/{username}"},
+        },
+        "stats": {"followerCount": 12345, "followingCount": 321, "heartCount": 987654, "videoCount": 210},
+    }
+
+
+# -----------------------------
+# Blobs
+# -----------------------------
+def make_blob(n_related, depth=6):
+    related = [make_item(i) for i in range(1, n_related + 1)]
+    nested = {"items": related}
+    for d in range(depth):
+        nested = {f"level{d}": nested, "meta": {"k": d}}
+
+    return {
+        "__DEFAULT_SCOPE__": {
+            "webapp.app-context": {"user": {"region": "NL"}},
+            "webapp.related": nested,
+            "webapp.video-detail": {"itemInfo": {"itemStruct": make_item(0)}},
+        }
+    }
+
+
+def make_profile_blob(n_videos=30):
+    return {
+        "__DEFAULT_SCOPE__": {
+            "webapp.user-detail": {
+                "userInfo": make_user_info(),
+                "itemList": [make_item(i) for i in range(1, n_videos + 1)],
+            }
+        }
+    }
+
+
+_ITEM_BYTES = None
+
+
+def blob_for_size(mb, depth=6):
+    # aantal related items zo kiezen dat de JSON ~mb groot is
+    global _ITEM_BYTES
+    if _ITEM_BYTES is None:
+        _ITEM_BYTES = len(json.dumps(make_item(500)).encode("utf-8")) + 2
+    n = max(1, int(mb * 1024 * 1024 / _ITEM_BYTES))
+    return make_blob(n, depth)
+
+
+def to_html(raw):
+    # raw JSON bytes -> pagina met de rehydration script tag (plus wat ruis ervoor)
+    head = b"<!doctype html><html><head><title>video</title>" + b"<meta name='x' content='y'>" * 200 + b"</head><body>"
+    return (
+        head
+        + b'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+        + raw.replace(b"</", b"<\\/")
+        + b"</script></body></html>"
+    )
+
+
+# -----------------------------
+# Corpus
+# -----------------------------
+DEFAULT_SIZES_MB = (1, 5, 10, 50)
+
+
+def load_recorded(directory):
+    # .json = rehydration JSON, .html = volledige pagina
+    from scraper.pageless import extract_rehydration_raw
+
+    out = {}
+    for f in sorted(Path(directory).glob("*")):
+        if f.suffix == ".json":
+            raw = f.read_bytes()
+        elif f.suffix == ".html":
+            raw = extract_rehydration_raw(f.read_bytes())
+        else:
+            continue
+        if raw:
+            out[f"recorded:{f.stem}"] = raw
+    return out
+
+
+def build_corpus(sizes_mb=DEFAULT_SIZES_MB, depth=6, recorded=None):
+    # naam -> raw JSON bytes
+    corpus = {"small": json.dumps(make_blob(20, depth)).encode("utf-8")}
+    for mb in sizes_mb:
+        corpus[f"{mb}mb"] = json.dumps(blob_for_size(mb, depth)).encode("utf-8")
+    corpus["deep"] = json.dumps(make_blob(200, depth=200)).encode("utf-8")
+    if recorded:
+        corpus.update(load_recorded(recorded))
+    return corpus
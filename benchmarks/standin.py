@@ -0,0 +1,317 @@
+# Lokale TikTok stand-in voor offline benchmarks: search, video en profiel
+# pagina's met een ingebedde __UNIVERSAL_DATA_FOR_REHYDRATION__ payload, plus
+# de search feed API die het grid vult tijdens het scrollen. Alles is
+# synthetisch en deterministisch (per keyword / video id), of komt uit een map
+# met opgenomen pagina's. Latency en fouten zijn instelbaar.
+#
+#   python benchmarks/standin.py --port 8765 --latency-ms 150 --error-rate 0.02
+import re
+import json
+import time
+import random
+import argparse
+import threading
+import urllib.parse
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_ID = 7_300_000_000_000_000_000
+
+
+# -----------------------------
+# Synthetische data
+# -----------------------------
+def _rng(*key):
+    return random.Random("|".join(map(str, key)))
+
+
+def make_video_item(video_id, username=None):
+    r = _rng("video", video_id)
+    username = username or f"user{r.randrange(400)}"
+    tags = [f"tag{r.randrange(50)}" for _ in range(r.randrange(1, 5))]
+    return {
+        "id": str(video_id),
+        "desc": f"synthetic video {video_id} " + " ".join(f"#{t}" for t in tags),
+        "createTime": 1_700_000_000 + r.randrange(30_000_000),
+        "video": {
+            "duration": r.randrange(5, 180),
+            "bitrateInfo": [{"Bitrate": r.randrange(100_000, 3_000_000), "CodecType": "h264"} for _ in range(4)],
+        },
+        "author": {"uniqueId": username, "nickname": username.title()},
+        "textExtra": [{"hashtagName": t, "type": 1} for t in tags],
+        "stats": {
+            "playCount": r.randrange(1_000, 5_000_000),
+            "diggCount": r.randrange(10, 500_000),
+            "commentCount": r.randrange(0, 20_000),
+            "shareCount": r.randrange(0, 10_000),
+            "collectCount": r.randrange(0, 50_000),
+        },
+    }
+
+
+def search_results(keyword, total):
+    r = _rng("search", keyword)
+    ids = r.sample(range(1, 10 * total + 1), total)
+    return [make_video_item(BASE_ID + i) for i in ids]
+
+
+def video_payload(video_id, related=20):
+    item = make_video_item(video_id)
+    r = _rng("related", video_id)
+    return {
+        "__DEFAULT_SCOPE__": {
+            "webapp.app-context": {"region": "NL", "language": "nl"},
+            "webapp.video-detail": {"itemInfo": {"itemStruct": item}, "statusCode": 0},
+            "webapp.related": {"itemList": [make_video_item(BASE_ID + r.randrange(10**9)) for _ in range(related)]},
+        }
+    }
+
+
+def profile_payload(username):
+    r = _rng("profile", username)
+    return {
+        "__DEFAULT_SCOPE__": {
+            "webapp.user-detail": {
+                "userInfo": {
+                    "user": {
+                        "uniqueId": username,
+                        "nickname": username.title(),
+                        "verified": r.random() < 0.1,
+                        "signature": f"bio van {username}",
+                        "bioLink": {"link": f"https://example.com/{username}"},
+                    },
+                    "stats": {
+                        "followerCount": r.randrange(100, 2_000_000),
+                        "followingCount": r.randrange(0, 2_000),
+                        "heartCount": r.randrange(1_000, 50_000_000),
+                        "videoCount": r.randrange(1, 3_000),
+                    },
+                },
+            }
+        }
+    }
+
+
+# -----------------------------
+# HTML
+# -----------------------------
+def _rehydration(payload):
+    raw = json.dumps(payload, ensure_ascii=False).replace("</", "<\\/")
+    return f'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">{raw}</script>'
+
+
+SEARCH_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>search</title>
+<style>#search_video-item-list > div { height: 320px; }</style></head>
+<body>
+<button data-testid="tux-web-tab-bar"><span>Top</span></button>
+<button data-testid="tux-web-tab-bar"><span>Videos</span></button>
+<div id="search_video-item-list"></div>
+<script>
+const kw = new URLSearchParams(location.search).get("q") || "";
+const list = document.getElementById("search_video-item-list");
+let offset = 0, hasMore = true, loading = false;
+
+async function more() {
+    if (loading || !hasMore) return;
+    loading = true;
+    try {
+        const r = await fetch(`/api/search/item/full/?keyword=${encodeURIComponent(kw)}&offset=${offset}`);
+        const data = await r.json();
+        for (const it of data.item_list || []) {
+            const card = document.createElement("div");
+            card.id = "grid-item-container-" + offset++;
+            const a = document.createElement("a");
+            a.href = `/@${it.author.uniqueId}/video/${it.id}`;
+            a.textContent = it.desc;
+            card.appendChild(a);
+            list.appendChild(card);
+        }
+        hasMore = !!data.has_more;
+    } catch (e) {
+    } finally {
+        loading = false;
+    }
+    if (document.body.scrollHeight <= innerHeight + scrollY + 400) more();
+}
+
+addEventListener("scroll", () => {
+    if (innerHeight + scrollY >= document.body.scrollHeight - 400) more();
+});
+more();
+</script>
+</body></html>
+"""
+
+
+def video_html(payload):
+    item = payload["__DEFAULT_SCOPE__"]["webapp.video-detail"]["itemInfo"]["itemStruct"]
+    return (
+        "<!doctype html><html><head><meta charset=\"utf-8\"><title>video</title></head><body>"
+        f"<div data-e2e=\"browse-video-desc\">{item['desc']}</div>"
+        f"{_rehydration(payload)}</body></html>"
+    )
+
+
+def profile_html(payload):
+    user = payload["__DEFAULT_SCOPE__"]["webapp.user-detail"]["userInfo"]["user"]
+    link = urllib.parse.quote(user["bioLink"]["link"], safe="")
+    return (
+        "<!doctype html><html><head><meta charset=\"utf-8\"><title>profile</title></head><body>"
+        f"<h2 data-e2e=\"user-bio\">{user['signature']}</h2>"
+        "<strong data-e2e=\"followers-count\">1</strong>"
+        "<div class=\"css-8ak5ua-7937d88b--DivShareLinks\">"
+        f"<a data-e2e=\"user-link\" href=\"/link/v2?target={link}\">link</a></div>"
+        f"{_rehydration(payload)}</body></html>"
+    )
+
+
+# -----------------------------
+# Server
+# -----------------------------
+VIDEO_PATH = re.compile(r"^/@([^/]+)/video/(\d+)$")
+PROFILE_PATH = re.compile(r"^/@([^/]+)$")
+
+
+class StandinConfig:
+    def __init__(self, results=60, page_size=12, related=20, latency_ms=100, jitter_ms=50,
+                 error_rate=0.0, empty_rate=0.0, recorded=None, seed=1):
+        self.results = results        # videos per keyword
+        self.page_size = page_size    # items per feed batch
+        self.related = related        # related items per video payload (paginagrootte)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate  # kans op 503 per pagina
+        self.empty_rate = empty_rate  # kans op een pagina zonder rehydration (lege stats)
+        self.recorded = Path(recorded) if recorded else None
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    config = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8"):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _roll(self):
+        cfg = self.config
+        with cfg.lock:
+            cfg.requests += 1
+            delay = max(0.0, cfg.latency_ms + cfg.random.uniform(-cfg.jitter_ms, cfg.jitter_ms))
+            error = cfg.random.random() < cfg.error_rate
+            empty = cfg.random.random() < cfg.empty_rate
+            if error:
+                cfg.errors += 1
+        time.sleep(delay / 1000)
+        return error, empty
+
+    def _recorded(self, path):
+        # opgenomen pagina: <recorded>/<pad met / -> _>.html, bv. _@user_video_123.html
+        if not self.config.recorded:
+            return None
+        f = self.config.recorded / (path.strip("/").replace("/", "_") + ".html")
+        return f.read_bytes() if f.is_file() else None
+
+    def do_GET(self):
+        cfg = self.config
+        url = urllib.parse.urlparse(self.path)
+        path = urllib.parse.unquote(url.path)
+        query = urllib.parse.parse_qs(url.query)
+
+        if path.rstrip("/") == "/api/search/item/full":
+            self._roll()
+            keyword = query.get("keyword", [""])[0]
+            offset = int(query.get("offset", ["0"])[0])
+            items = search_results(keyword, cfg.results)[offset:offset + cfg.page_size]
+            payload = {"item_list": items, "has_more": int(offset + cfg.page_size < cfg.results)}
+            return self._send(200, json.dumps(payload), "application/json")
+
+        if path == "/search":
+            self._roll()
+            return self._send(200, SEARCH_HTML)
+
+        match = VIDEO_PATH.match(path) or PROFILE_PATH.match(path)
+        if not match:
+            return self._send(404, "not found", "text/plain")
+
+        error, empty = self._roll()
+        if error:
+            return self._send(503, "injected error", "text/plain")
+
+        recorded = self._recorded(path)
+        if recorded is not None:
+            return self._send(200, recorded)
+        if empty:
+            return self._send(200, "<!doctype html><html><body></body></html>")
+
+        if match.re is VIDEO_PATH:
+            return self._send(200, video_html(video_payload(match.group(2), cfg.related)))
+        return self._send(200, profile_html(profile_payload(match.group(1))))
+
+
+class StandinServer:
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or StandinConfig()
+        handler = type("Handler", (StandinHandler,), {"config": self.config})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Lokale TikTok stand-in server")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--results", type=int, default=60)
+    ap.add_argument("--related", type=int, default=20)
+    ap.add_argument("--latency-ms", type=float, default=100)
+    ap.add_argument("--jitter-ms", type=float, default=50)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--empty-rate", type=float, default=0.0)
+    ap.add_argument("--recorded", default=None, help="map met opgenomen pagina's")
+    args = ap.parse_args()
+
+    config = StandinConfig(
+        results=args.results, related=args.related, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, empty_rate=args.empty_rate, recorded=args.recorded,
+    )
+    server = StandinServer(config, port=args.port)
+    print(f"stand-in op {server.url} (search: {server.url}/search?q=test)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
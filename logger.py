@@ -1,29 +1,140 @@
+import json
+import time
+import atexit
+import queue
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from pathlib import Path
 
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
 LOG_FILE = LOG_DIR / "scraper.log"
+EVENTS_FILE = LOG_DIR / "scraper.jsonl"
+
+LOG_FORMAT = "json"  # "json" = JSON lines in EVENTS_FILE, "text" = oude regels in LOG_FILE
+
+_listener = None
+
+
+# -----------------------------
+# JSON lines
+# -----------------------------
+# Bestaande regels zijn "EVENT | key=value | ..."; die worden hier (op de
+# listener thread, niet op de event loop) omgezet naar één JSON object per regel.
+def _value(v):
+    try:
+        return int(v)
+    except ValueError:
+        pass
+    try:
+        return float(v)
+    except ValueError:
+        return v
+
+
+def parse_event(message):
+    parts = message.split(" | ")
+    event = {"event": parts[0]}
+    for part in parts[1:]:
+        key, sep, value = part.partition("=")
+        if sep:
+            event[key.strip()] = _value(value.strip())
+        else:
+            event.setdefault("extra", []).append(part)
+    return event
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        out = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+        }
+        out.update(parse_event(record.getMessage()))
+        out.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        return json.dumps(out, ensure_ascii=False, default=str)
+
 
 def setup_logger():
+    # idempotent: handlers worden maar één keer aangemaakt, ook bij meerdere imports
+    global _listener
     logger = logging.getLogger("scraper")
+    if _listener is not None:
+        return logger
+
     logger.setLevel(logging.INFO)
+    logger.propagate = False
 
-    handler = RotatingFileHandler(
-        LOG_FILE,
-        maxBytes=5 * 1024 * 1024,  # 5 MB
-        backupCount=5,
-        encoding="utf-8"
-    )
+    if LOG_FORMAT == "json":
+        handler = RotatingFileHandler(EVENTS_FILE, maxBytes=5 * 1024 * 1024, backupCount=5, encoding="utf-8")
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler = RotatingFileHandler(LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=5, encoding="utf-8")
+        handler.setFormatter(logging.Formatter(
+            "%(asctime)s | %(levelname)s | %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S"
+        ))
 
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    # schrijven + roteren gebeurt op een achtergrond thread; de event loop
+    # zet alleen een record in de queue
+    log_queue = queue.SimpleQueue()
+    logger.handlers.clear()
+    logger.addHandler(QueueHandler(log_queue))
 
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
 
     return logger
+
+
+# -----------------------------
+# Structured events
+# -----------------------------
+def log_event(logger, event, level=logging.INFO, **fields):
+    # zelfde "EVENT | key=value" regel, velden gaan ook als echte JSON types mee
+    if not logger.isEnabledFor(level):
+        return
+    message = " | ".join([event] + [f"{k}={v}" for k, v in fields.items()])
+    logger.log(level, message, extra={"fields": fields})
+
+
+# -----------------------------
+# Rate limiting voor hot loops
+# -----------------------------
+# Alleen voor progress/debug regels; fouten altijd via log_event loggen.
+class RateLimiter:
+    # max `burst` regels per `interval` seconden per key; de rest wordt geteld
+    # en bij de volgende doorgelaten regel als suppressed=N meegegeven
+    def __init__(self, interval=5.0, burst=5):
+        self.interval = interval
+        self.burst = burst
+        self._windows = {}
+
+    def allow(self, key):
+        now = time.monotonic()
+        start, sent, suppressed = self._windows.get(key, (now, 0, 0))
+        if now - start >= self.interval:
+            start, sent = now, 0
+        if sent < self.burst:
+            self._windows[key] = (start, sent + 1, 0)
+            return True, suppressed
+        self._windows[key] = (start, sent, suppressed + 1)
+        return False, suppressed + 1
+
+
+_limiter = RateLimiter()
+
+
+def log_limited(logger, key, event, level=logging.INFO, **fields):
+    if not logger.isEnabledFor(level):
+        return
+    allowed, suppressed = _limiter.allow(key)
+    if not allowed:
+        return
+    if suppressed:
+        fields["suppressed"] = suppressed
+    log_event(logger, event, level, **fields)
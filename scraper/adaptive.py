@@ -0,0 +1,154 @@
+import time
+import asyncio
+import logging
+from contextlib import contextmanager
+
+from scraper.metrics import metrics
+
+logger = logging.getLogger("scraper")
+
+# taak -> slot van de limiter waar die taak nu in zit (zie fetch_timer)
+_active = {}
+
+
+@contextmanager
+def fetch_timer():
+    # rond de echte fetch, na het leasen van een tab: alleen deze tijd telt
+    # als latency sample. Items zonder fetch (seen-index / profiel-cache hit)
+    # leveren dus geen sample op en wachten op de page pool telt niet mee.
+    slot = _active.get(asyncio.current_task())
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if slot is not None:
+            slot["fetch_s"] += time.perf_counter() - t0
+            slot["fetched"] = True
+
+
+# -----------------------------
+# AIMD concurrency limiter
+# -----------------------------
+# Drop-in voor de asyncio.Semaphore die als `limiter` aan iter_video_records /
+# run_keywords meegegeven wordt. Per venster van `window` afgeronde fetches:
+#   - gezond (weinig fouten, weinig lege payloads, latency niet opgelopen)
+#     en de limiet werd ook echt benut -> limiet + increase
+#   - anders -> limiet * decrease (min. min_limit)
+# Wachtende taken worden in FIFO volgorde doorgelaten. Latency = de tijd
+# binnen fetch_timer(), niet de hele slot.
+class AdaptiveLimiter:
+    def __init__(self, initial=2, min_limit=1, max_limit=16, increase=1, decrease=0.5, window=20,
+                 max_error_rate=0.1, max_empty_rate=0.2, latency_factor=2.0):
+        self.limit = max(min_limit, min(initial, max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.max_empty_rate = max_empty_rate
+        self.latency_factor = latency_factor
+
+        self.inflight = 0
+        self._cond = asyncio.Condition()
+        self._samples = []
+        self._saturated = False
+        self.baseline_ms = None
+        self._last_decrease = 0.0
+
+        self.started = time.perf_counter()
+        self.history = [(0.0, self.limit, "start")]
+        metrics.set_concurrency(self.limit)
+
+    # -----------------------------
+    # Semaphore interface
+    # -----------------------------
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.inflight < self.limit)
+            self.inflight += 1
+            if self.inflight >= self.limit:
+                self._saturated = True
+        _active[asyncio.current_task()] = {"t0": time.perf_counter(), "empty": False, "fetch_s": 0.0, "fetched": False}
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        slot = _active.pop(asyncio.current_task(), None)
+        error = None if exc_type is None or issubclass(exc_type, asyncio.CancelledError) else exc_type.__name__
+
+        async with self._cond:
+            self.inflight -= 1
+            # alleen slots met een echte fetch; fetches die al liepen voor de
+            # laatste verlaging tellen niet mee, anders wordt dezelfde
+            # overbelasting twee keer afgestraft
+            if (slot and slot["fetched"] and (exc_type is None or error)
+                    and slot["t0"] >= self._last_decrease):
+                self._samples.append((slot["fetch_s"] * 1000, error, slot["empty"]))
+            if len(self._samples) >= self.window:
+                self._adjust()
+            self._cond.notify_all()
+        return False
+
+    def mark_empty(self):
+        # aanroepen binnen `async with limiter` als de fetch een lege payload gaf
+        slot = _active.get(asyncio.current_task())
+        if slot:
+            slot["empty"] = True
+
+    # -----------------------------
+    # AIMD
+    # -----------------------------
+    def _adjust(self):
+        samples, self._samples = self._samples, []
+        n = len(samples)
+        errors = [e for _, e, _ in samples if e]
+        error_rate = len(errors) / n
+        empty_rate = sum(1 for _, e, empty in samples if empty and not e) / n
+        ok_latency = sorted(ms for ms, e, _ in samples if not e)
+        p50 = ok_latency[len(ok_latency) // 2] if ok_latency else None
+
+        if self.baseline_ms is None and p50 is not None:
+            self.baseline_ms = p50
+
+        if error_rate > self.max_error_rate:
+            timeouts = sum(1 for e in errors if "Timeout" in e)
+            reason = f"errors={error_rate:.2f}(timeouts={timeouts})"
+        elif empty_rate > self.max_empty_rate:
+            reason = f"empty={empty_rate:.2f}"
+        elif p50 is not None and p50 > self.baseline_ms * self.latency_factor:
+            reason = f"latency_p50={p50:.0f}ms>baseline={self.baseline_ms:.0f}ms"
+        else:
+            reason = None
+
+        old = self.limit
+        if reason:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease))
+            self._last_decrease = time.perf_counter()
+        else:
+            if self._saturated:
+                self.limit = min(self.max_limit, self.limit + self.increase)
+                reason = "healthy"
+            # baseline schuift langzaam mee met de gezonde latency
+            if p50 is not None:
+                self.baseline_ms = min(p50, self.baseline_ms * 0.9 + p50 * 0.1)
+        self._saturated = self.inflight >= self.limit
+
+        if self.limit != old:
+            elapsed = time.perf_counter() - self.started
+            self.history.append((round(elapsed, 2), self.limit, reason))
+            metrics.set_concurrency(self.limit)
+            logger.info(
+                f"CONCURRENCY_ADJUST | from={old} | to={self.limit} | reason={reason} | "
+                f"window={n} | error_rate={error_rate:.2f} | empty_rate={empty_rate:.2f} | "
+                f"p50_ms={p50 if p50 is None else round(p50)}"
+            )
+
+    def summary(self):
+        limits = [limit for _, limit, _ in self.history]
+        return {
+            "limit": self.limit,
+            "min": min(limits),
+            "max": max(limits),
+            "adjustments": len(self.history) - 1,
+            "history": list(self.history),
+        }
@@ -1,5 +1,10 @@
+import time
+import logging
+
 from playwright.async_api import async_playwright
 
+logger = logging.getLogger("scraper")
+
 DESKTOP = {
     "viewport": {"width": 1280, "height": 800},
     "device_scale_factor": 1,
@@ -14,8 +19,95 @@ DESKTOP = {
 
 CHROME_CDP_URL = "http://localhost:9222"
 
+# persistent mode: ingelogde sessie direct uit deze map, geen handmatige Chrome nodig
+SESSION_DIR = "tiktok_session_webkit"
+SESSION_ENGINE = "webkit"  # engine waarmee SESSION_DIR is aangemaakt
+SESSION_HEADLESS = True
+
+
+# -----------------------------
+# Eén Playwright instance per proces
+# -----------------------------
+_playwright = None
+_persistent = {}
+
+
+async def get_playwright():
+    global _playwright
+    if _playwright is None:
+        _playwright = await async_playwright().start()
+    return _playwright
+
+
+class SharedPlaywright:
+    # wat get_browser() in persistent mode als `playwright` teruggeeft: stop()
+    # van de caller sluit de gedeelde instance via shutdown() af, zodat een
+    # volgende get_browser() een nieuwe start i.p.v. een gestopte te hergebruiken
+    def __init__(self, playwright):
+        self._playwright = playwright
+
+    def __getattr__(self, name):
+        return getattr(self._playwright, name)
+
+    async def stop(self):
+        await shutdown()
+
+
+async def shutdown():
+    global _playwright
+    for context in list(_persistent.values()):
+        try:
+            await context.close()
+        except Exception:
+            pass
+    _persistent.clear()
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
+
+
+async def launch_persistent(session_dir=SESSION_DIR, engine=SESSION_ENGINE,
+                            headless=SESSION_HEADLESS, proxy=None):
+    t0 = time.perf_counter()
+    warm = _playwright is not None
+    playwright = await get_playwright()
+    t_pw = time.perf_counter()
+
+    key = (engine, session_dir)
+    context = _persistent.get(key)
+    reused = context is not None
+    if reused:
+        try:
+            page = await context.new_page()
+        except Exception:
+            # context is intussen gesloten
+            _persistent.pop(key, None)
+            reused = False
+
+    if not reused:
+        options = dict(DESKTOP, headless=headless)
+        if proxy:
+            options["proxy"] = {"server": proxy}
+        context = await getattr(playwright, engine).launch_persistent_context(session_dir, **options)
+        _persistent[key] = context
+        page = context.pages[0] if context.pages else await context.new_page()
+
+    t_end = time.perf_counter()
+    logger.info(
+        f"BROWSER_START | mode=persistent | engine={engine} | start={'warm' if warm else 'cold'} | "
+        f"context={'reused' if reused else 'launched'} | playwright_ms={(t_pw - t0) * 1000:.0f} | "
+        f"launch_ms={(t_end - t_pw) * 1000:.0f} | total_ms={(t_end - t0) * 1000:.0f}"
+    )
+    # een persistent context heeft geen Browser (context.browser is None); als
+    # `browser` gaat de context zelf terug, zodat browser.close() gewoon werkt
+    return SharedPlaywright(playwright), context, context, page
+
 
 async def get_browser(proxy: str | None = None, browser_type: str = "chromium"):
+    if browser_type == "persistent":
+        return await launch_persistent(proxy=proxy)
+
+    # oude modes: eigen instance, de caller stopt hem zelf
     playwright = await async_playwright().start()
 
     if browser_type == "cdp-chrome":
@@ -0,0 +1,134 @@
+import json
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# -----------------------------
+# Generic JSON decode
+# -----------------------------
+# Snelste beschikbare backend: orjson, anders msgspec, anders stdlib json.
+def loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    if msgspec is not None:
+        return msgspec.json.decode(raw)
+    return json.loads(raw)
+
+
+def backend():
+    # zelfde volgorde als loads()
+    if orjson is not None:
+        return "orjson"
+    if msgspec is not None:
+        return "msgspec"
+    return "json"
+
+
+# -----------------------------
+# Typed decode (msgspec)
+# -----------------------------
+# Alleen de velden die we gebruiken worden gedecodeerd; onbekende velden
+# (related videos, bitrate info, ...) slaat msgspec over zonder ze als dicts
+# op te bouwen. Klopt het schema niet, dan valt de caller terug op loads().
+if msgspec is not None:
+    Count = int | str | None
+
+    class Stats(msgspec.Struct, rename="camel", omit_defaults=True):
+        play_count: Count = None
+        view_count: Count = None
+        digg_count: Count = None
+        comment_count: Count = None
+        share_count: Count = None
+        repost_count: Count = None
+        collect_count: Count = None
+        favorite_count: Count = None
+        bookmark_count: Count = None
+
+    class TextExtra(msgspec.Struct, rename="camel", omit_defaults=True):
+        hashtag_name: str | None = None
+
+    class Video(msgspec.Struct, omit_defaults=True):
+        duration: int | float | None = None
+
+    class ItemStruct(msgspec.Struct, rename="camel", omit_defaults=True):
+        id: str | None = None
+        desc: str | None = None
+        create_time: int | str | None = None
+        video: Video = msgspec.field(default_factory=Video)
+        text_extra: list[TextExtra] = msgspec.field(default_factory=list)
+        stats: Stats = msgspec.field(default_factory=Stats)
+
+    class ItemInfo(msgspec.Struct, rename="camel", omit_defaults=True):
+        item_struct: ItemStruct | None = None
+
+    class VideoDetail(msgspec.Struct, rename="camel", omit_defaults=True):
+        item_info: ItemInfo | None = None
+
+    class UserStats(msgspec.Struct, rename="camel", omit_defaults=True):
+        follower_count: Count = None
+        following_count: Count = None
+        heart_count: Count = None
+        video_count: Count = None
+
+    class BioLink(msgspec.Struct, omit_defaults=True):
+        link: str | None = None
+
+    class User(msgspec.Struct, rename="camel", omit_defaults=True):
+        nickname: str | None = None
+        verified: bool | None = None
+        signature: str | None = None
+        bio_link: BioLink | None = None
+
+    class UserInfo(msgspec.Struct, omit_defaults=True):
+        user: User = msgspec.field(default_factory=User)
+        stats: UserStats = msgspec.field(default_factory=UserStats)
+
+    class UserDetail(msgspec.Struct, rename="camel", omit_defaults=True):
+        user_info: UserInfo | None = None
+
+    class Scope(msgspec.Struct, omit_defaults=True):
+        video_detail: VideoDetail | None = msgspec.field(default=None, name="webapp.video-detail")
+        user_detail: UserDetail | None = msgspec.field(default=None, name="webapp.user-detail")
+
+    class Rehydration(msgspec.Struct, omit_defaults=True):
+        scope: Scope | None = msgspec.field(default=None, name="__DEFAULT_SCOPE__")
+
+    _decoder = msgspec.json.Decoder(Rehydration)
+
+
+def _decode_scope(raw):
+    if msgspec is None:
+        return None
+    try:
+        doc = _decoder.decode(raw)
+    except (msgspec.DecodeError, msgspec.ValidationError):
+        return None
+    return doc.scope
+
+
+def decode_video_item(raw):
+    # projectie van webapp.video-detail.itemInfo.itemStruct als dict
+    # (camelCase keys, zelfde vorm als in de rehydration JSON), of None
+    scope = _decode_scope(raw)
+    if not scope or not scope.video_detail or not scope.video_detail.item_info:
+        return None
+    item = scope.video_detail.item_info.item_struct
+    if not item or not item.id:
+        return None
+    return msgspec.to_builtins(item)
+
+
+def decode_user_info(raw):
+    # projectie van webapp.user-detail.userInfo als dict, of None
+    scope = _decode_scope(raw)
+    if not scope or not scope.user_detail or not scope.user_detail.user_info:
+        return None
+    return msgspec.to_builtins(scope.user_detail.user_info)
@@ -0,0 +1,117 @@
+# -----------------------------
+# In-page extractors
+# -----------------------------
+# Eén page.evaluate per pagina: het script zoekt in de pagina zelf de data op
+# en stuurt alleen de velden terug die we gebruiken, in plaats van de hele
+# rehydration JSON over CDP te sturen.
+
+VIDEO_EXTRACTOR_JS = """
+(targetId) => {
+    const pickStats = (s) => {
+        s = s || {};
+        return {
+            playCount: s.playCount, viewCount: s.viewCount,
+            diggCount: s.diggCount, commentCount: s.commentCount,
+            shareCount: s.shareCount, repostCount: s.repostCount,
+            collectCount: s.collectCount, favoriteCount: s.favoriteCount,
+            bookmarkCount: s.bookmarkCount,
+        };
+    };
+
+    const project = (item) => ({
+        id: item.id,
+        desc: item.desc,
+        createTime: item.createTime,
+        video: { duration: (item.video || {}).duration },
+        textExtra: (item.textExtra || [])
+            .filter(h => h && h.hashtagName)
+            .map(h => ({ hashtagName: h.hashtagName })),
+        stats: pickStats(item.stats),
+    });
+
+    const detailItem = (data) =>
+        data?.__DEFAULT_SCOPE__?.["webapp.video-detail"]?.itemInfo?.itemStruct || null;
+
+    const findItem = (root) => {
+        let byId = null, first = null;
+        const stack = [root];
+        while (stack.length) {
+            const obj = stack.pop();
+            if (!obj || typeof obj !== "object") continue;
+            if (Array.isArray(obj)) {
+                for (let i = obj.length - 1; i >= 0; i--) stack.push(obj[i]);
+                continue;
+            }
+            if (targetId && obj.id === String(targetId) && "stats" in obj) { byId = obj; break; }
+            if (!first && "id" in obj && "desc" in obj && "video" in obj && "stats" in obj) first = obj;
+            const vals = Object.values(obj);
+            for (let i = vals.length - 1; i >= 0; i--) stack.push(vals[i]);
+        }
+        return byId || first;
+    };
+
+    const domDesc = document.querySelector("div[data-e2e='browse-video-desc']")?.innerText?.trim() || null;
+
+    const universal = window.__UNIVERSAL_DATA__ || null;
+    let item = universal ? detailItem(universal) : null;
+    if (item && Object.keys(item).length) {
+        return { source: "universal", item: project(item), domDesc };
+    }
+
+    const raw = document.querySelector("#__UNIVERSAL_DATA_FOR_REHYDRATION__")?.textContent;
+    if (raw) {
+        try {
+            const scope = JSON.parse(raw).__DEFAULT_SCOPE__ || {};
+            item = findItem(scope);
+            if (item) return { source: "rehydration", item: project(item), domDesc };
+        } catch (e) {}
+    }
+
+    return { source: null, item: null, domDesc };
+}
+"""
+
+PROFILE_EXTRACTOR_JS = """
+() => {
+    const bio = document.querySelector("h2[data-e2e='user-bio']")?.innerText?.trim() || null;
+
+    const links = new Set();
+    const container = document.querySelector("div.css-8ak5ua-7937d88b--DivShareLinks");
+    if (container) {
+        for (const a of container.querySelectorAll("a[data-e2e='user-link']")) {
+            let href = a.getAttribute("href");
+            if (!href) continue;
+            if (href.includes("target=")) {
+                try {
+                    const target = new URL(href, location.href).searchParams.get("target");
+                    if (target) href = decodeURIComponent(target);
+                } catch (e) {}
+            }
+            links.add(href);
+        }
+    }
+
+    let data = window.__UNIVERSAL_DATA__ || null;
+    if (!data) {
+        const raw = document.querySelector("#__UNIVERSAL_DATA_FOR_REHYDRATION__")?.textContent;
+        try { data = raw ? JSON.parse(raw) : null; } catch (e) { data = null; }
+    }
+
+    let stats = {};
+    const scope = data?.__DEFAULT_SCOPE__ || {};
+    const key = Object.keys(scope).find(k => k.toLowerCase().includes("user"));
+    const block = key ? scope[key] : null;
+    if (block) {
+        const info = block.userInfo || {};
+        const s = info.stats || {};
+        const u = info.user || {};
+        stats = {
+            nickname: u.nickname, verified: u.verified,
+            followers: s.followerCount, following: s.followingCount,
+            likes: s.heartCount, videos: s.videoCount,
+        };
+    }
+
+    return { bio, bioLinks: Array.from(links), stats };
+}
+"""
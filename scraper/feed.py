@@ -0,0 +1,65 @@
+import logging
+
+from scraper.grid import is_search_feed
+
+logger = logging.getLogger("scraper")
+
+
+# -----------------------------
+# Search feed harvester
+# -----------------------------
+# Tijdens het scrollen haalt de zoekpagina zelf al JSON batches op met
+# complete itemStructs (stats, desc, textExtra, author). Die vangen we hier af
+# zodat we de videopagina alleen nog hoeven te bezoeken als er velden missen.
+def feed_items(payload):
+    if not isinstance(payload, dict):
+        return []
+    # /api/search/item/full -> item_list, /api/search/general/full -> data[].item
+    items = payload.get("item_list")
+    if items is None:
+        items = [d.get("item") for d in payload.get("data") or [] if isinstance(d, dict)]
+    return [it for it in items or [] if isinstance(it, dict) and it.get("id")]
+
+
+class FeedHarvester:
+    def __init__(self, parse_item):
+        # parse_item: itemStruct -> video_data dict (zelfde vorm als fetch_video_stats)
+        self.parse_item = parse_item
+        self.items = {}
+        self.responses = 0
+        self._page = None
+
+    async def _on_response(self, response):
+        if not is_search_feed(response.url):
+            return
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+
+        self.responses += 1
+        for item in feed_items(payload):
+            parsed = self.parse_item(item)
+            if parsed:
+                self.items[str(item["id"])] = parsed
+
+    def attach(self, page):
+        self._page = page
+        page.on("response", self._on_response)
+
+    def detach(self):
+        if self._page:
+            self._page.remove_listener("response", self._on_response)
+            self._page = None
+        logger.info(f"FEED_HARVEST | responses={self.responses} | items={len(self.items)}")
+
+    def get(self, video_id):
+        return self.items.get(str(video_id))
+
+
+def is_complete(video_data):
+    # zonder deze velden valt een item terug op een bezoek aan de videopagina
+    if not video_data or not video_data.get("video_id"):
+        return False
+    stats = video_data.get("stats") or {}
+    return stats.get("views") is not None and video_data.get("create_time") is not None
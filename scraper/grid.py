@@ -0,0 +1,167 @@
+import time
+import asyncio
+import logging
+
+from logger import log_event
+from scraper.readiness import wait_for_condition
+
+logger = logging.getLogger("scraper")
+
+
+# -----------------------------
+# Mutation-driven grid loader
+# -----------------------------
+# Een MutationObserver in de pagina houdt het aantal kaarten bij, en de
+# search feed responses vertellen of er nog meer komt (has_more). Daardoor
+# scrollen we direct door zodra nieuwe kaarten er staan en stoppen we zodra
+# de feed op is, in plaats van 5 rondes van 1500 ms af te wachten.
+GRID_WATCH_JS = """
+(sel) => {
+    if (!window.__gridWatch) {
+        // verzamelt elke kaart 1x (op video id) zodra hij verschijnt, ook als
+        // de lijst virtualiseert en oude nodes hergebruikt of weggooit
+        const state = window.__gridWatch = {
+            count: 0, lastGrowth: Date.now(), seen: new Set(), pending: new Set(), out: [], order: 0,
+        };
+
+        const take = (card) => {
+            const href = card.querySelector("a[href*='/video/']")?.getAttribute("href");
+            const m = href && href.match(/\/video\/(\d+)/);
+            if (!m) { state.pending.add(card); return; }
+            state.pending.delete(card);
+            if (state.seen.has(m[1])) return;
+
+            state.seen.add(m[1]);
+            state.order += 1;
+            const pos = (card.id || "").match(/grid-item-container-(\d+)/);
+            state.out.push({
+                idx: pos ? Number(pos[1]) + 1 : state.order,
+                href,
+                desc: (card.innerText || "").slice(0, 500),
+            });
+            state.count = state.seen.size;
+            state.lastGrowth = Date.now();
+        };
+
+        const scan = (node) => {
+            if (node.nodeType !== 1) return;
+            if (node.matches(sel)) take(node);
+            else node.querySelectorAll(sel).forEach(take);
+        };
+
+        document.querySelectorAll(sel).forEach(take);
+
+        const root = document.querySelector("#search_video-item-list") || document.body;
+        new MutationObserver((mutations) => {
+            for (const mut of mutations) {
+                if (mut.type === "attributes") {
+                    const card = mut.target.closest?.(sel);
+                    if (card) take(card);
+                } else {
+                    mut.addedNodes.forEach(scan);
+                }
+            }
+            state.pending.forEach(take);
+        }).observe(root, { childList: true, subtree: true, attributes: true, attributeFilter: ["href"] });
+
+        window.__gridDrain = () => { const out = state.out; state.out = []; return out; };
+    }
+    return window.__gridWatch.count;
+}
+"""
+
+GRID_DRAIN_JS = "() => window.__gridDrain ? window.__gridDrain() : []"
+
+GRID_GREW_JS = "(n) => (window.__gridWatch ? window.__gridWatch.count : 0) > n"
+
+SEARCH_FEED_PATTERNS = ("/api/search/item/full", "/api/search/general/full")
+
+IDLE_ROUNDS = 3        # rondes zonder groei als er geen feed signaal is
+ROUND_CAP_MS = 1500    # max wachten per ronde (= oude vaste sleep)
+END_SETTLE_MS = 500    # na has_more=0 nog even wachten op de laatste kaarten
+
+
+def is_search_feed(url):
+    return any(p in url for p in SEARCH_FEED_PATTERNS)
+
+
+async def load_grid(page, selector, max_videos=500, on_cards=None):
+    # scrollt tot de feed op is en geeft de verzamelde kaarten terug
+    # ({idx, href, desc}), in kleine batches per ronde uit de pagina gehaald.
+    # on_cards: optionele async callback per nieuwe batch
+    cards = []
+
+    async def drain():
+        batch = await page.evaluate(GRID_DRAIN_JS)
+        cards.extend(batch)
+        if on_cards and batch:
+            await on_cards(batch)
+
+    feed_ended = asyncio.Event()
+
+    async def on_response(response):
+        if not is_search_feed(response.url):
+            return
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        if not payload.get("has_more", 1):
+            feed_ended.set()
+
+    page.on("response", on_response)
+
+    t0 = time.perf_counter()
+    count = await page.evaluate(GRID_WATCH_JS, selector)
+    await drain()
+    idle = 0
+    rounds = 0
+    reason = "idle"
+
+    try:
+        while True:
+            if count >= max_videos:
+                reason = "max_videos"
+                break
+
+            await page.evaluate("window.scrollBy(0, window.innerHeight)")
+            rounds += 1
+
+            cap = END_SETTLE_MS if feed_ended.is_set() else ROUND_CAP_MS
+            grew = await wait_for_condition(page, "scroll", GRID_GREW_JS, arg=count, cap_ms=cap)
+            await drain()
+            count = len(cards)
+
+            if grew:
+                idle = 0
+                continue
+
+            if feed_ended.is_set():
+                reason = "feed_end"
+                break
+
+            idle += 1
+            if idle >= IDLE_ROUNDS:
+                break
+
+            # vastgelopen: klik rechtsonder om lazy loading weer op gang te helpen
+            try:
+                viewport = await page.evaluate("({width: window.innerWidth, height: window.innerHeight})")
+                await page.mouse.click(viewport["width"] - 5, viewport["height"] - 5)
+            except Exception:
+                pass
+    finally:
+        page.remove_listener("response", on_response)
+
+    report_grid_rate("mutation", count, time.perf_counter() - t0, rounds, reason)
+    cards.sort(key=lambda c: c["idx"])
+    return cards
+
+
+def report_grid_rate(loader, count, elapsed, rounds, reason):
+    rate = count / elapsed if elapsed > 0 else 0.0
+    log_event(
+        logger, "SCROLL_DONE", logging.INFO,
+        loader=loader, cards=count, rounds=rounds, duration=round(elapsed, 2),
+        cards_per_s=round(rate, 2), reason=reason,
+    )
@@ -0,0 +1,119 @@
+import json
+import time
+import sqlite3
+from pathlib import Path
+
+
+# -----------------------------
+# Crawl journal (SQLite)
+# -----------------------------
+# Per keyword worden de gevonden video_items, de status per video_id en de
+# afgeronde records bijgehouden. Een onderbroken run slaat bij een herstart
+# de zoekpagina en alle afgeronde items over, probeert alleen pending/failed
+# items opnieuw en geeft de eerder afgeronde records nog een keer terug.
+# Een keyword dat helemaal klaar is (completed_at) wordt de volgende keer
+# gewoon opnieuw gezocht.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keywords (
+    keyword       TEXT PRIMARY KEY,
+    discovered_at REAL NOT NULL,
+    completed_at  REAL
+);
+CREATE TABLE IF NOT EXISTS items (
+    keyword    TEXT NOT NULL,
+    video_id   TEXT NOT NULL,
+    idx        INTEGER NOT NULL,
+    item_json  TEXT NOT NULL,
+    status     TEXT NOT NULL DEFAULT 'pending',
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    error      TEXT,
+    record_json TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (keyword, video_id)
+);
+"""
+
+
+class CrawlJournal:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(SCHEMA)
+        self._migrate()
+        self.db.commit()
+
+    def _migrate(self):
+        # journals van voor completed_at / record_json
+        for table, column in (("keywords", "completed_at REAL"), ("items", "record_json TEXT")):
+            existing = {r[1] for r in self.db.execute(f"PRAGMA table_info({table})")}
+            if column.split()[0] not in existing:
+                self.db.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+
+    def close(self):
+        self.db.close()
+
+    # -----------------------------
+    # Discovery
+    # -----------------------------
+    def get_items(self, keyword):
+        row = self.db.execute("SELECT 1 FROM keywords WHERE keyword = ?", (keyword,)).fetchone()
+        if not row:
+            return None
+        rows = self.db.execute(
+            "SELECT item_json FROM items WHERE keyword = ? ORDER BY idx", (keyword,)
+        ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def save_items(self, keyword, video_items):
+        now = time.time()
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO keywords (keyword, discovered_at) VALUES (?, ?)", (keyword, now)
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO items (keyword, video_id, idx, item_json, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(keyword, it["video_id"], it["idx"], json.dumps(it, ensure_ascii=False), now)
+                 for it in video_items],
+            )
+
+    def is_complete(self, keyword):
+        row = self.db.execute("SELECT completed_at FROM keywords WHERE keyword = ?", (keyword,)).fetchone()
+        return bool(row and row[0])
+
+    def mark_complete(self, keyword):
+        with self.db:
+            self.db.execute("UPDATE keywords SET completed_at = ? WHERE keyword = ?", (time.time(), keyword))
+
+    def reset(self, keyword):
+        with self.db:
+            self.db.execute("DELETE FROM items WHERE keyword = ?", (keyword,))
+            self.db.execute("DELETE FROM keywords WHERE keyword = ?", (keyword,))
+
+    # -----------------------------
+    # Status per video
+    # -----------------------------
+    def done_records(self, keyword):
+        # video_id -> record, in idx volgorde; done zonder record (oud journal) telt niet
+        rows = self.db.execute(
+            "SELECT video_id, record_json FROM items "
+            "WHERE keyword = ? AND status = 'done' AND record_json IS NOT NULL ORDER BY idx",
+            (keyword,),
+        ).fetchall()
+        return {r[0]: json.loads(r[1]) for r in rows}
+
+    def _set_status(self, keyword, video_id, status, error=None, record=None):
+        with self.db:
+            self.db.execute(
+                "UPDATE items SET status = ?, error = ?, record_json = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE keyword = ? AND video_id = ?",
+                (status, error, json.dumps(record, ensure_ascii=False) if record else None,
+                 time.time(), keyword, video_id),
+            )
+
+    def mark_done(self, keyword, video_id, record=None):
+        self._set_status(keyword, video_id, "done", record=record)
+
+    def mark_failed(self, keyword, video_id, error=None):
+        self._set_status(keyword, video_id, "failed", str(error) if error else None)
@@ -0,0 +1,146 @@
+import time
+import logging
+from contextlib import contextmanager
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+logger = logging.getLogger("scraper")
+
+
+# -----------------------------
+# Stage metrics
+# -----------------------------
+# Timing spans rond elke hot step (goto, readiness, evaluate, json parse,
+# parsers, profiel extractie, write). Altijd lokaal geaggregeerd voor de
+# STAGE_STATS log regel; met prometheus-client ook als histogram/counters op
+# een lokaal /metrics endpoint.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class StageMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.errors = {}
+        self.pages = {}
+        self.bytes = {}
+        self.concurrency = None
+
+        self._prom = None
+        if prometheus_client is not None:
+            self._prom = {
+                "stage": prometheus_client.Histogram(
+                    "scraper_stage_seconds", "Duration of a scraper stage", ["stage"], buckets=BUCKETS
+                ),
+                "errors": prometheus_client.Counter(
+                    "scraper_errors_total", "Errors per stage and exception type", ["stage", "type"]
+                ),
+                "pages": prometheus_client.Counter(
+                    "scraper_pages_total", "Fetched pages", ["page_type", "mode"]
+                ),
+                "bytes": prometheus_client.Counter(
+                    "scraper_bytes_total", "Bytes transferred", ["source"]
+                ),
+                "concurrency": prometheus_client.Gauge(
+                    "scraper_effective_concurrency", "Current in-flight limit of the adaptive limiter"
+                ),
+            }
+
+    def observe(self, stage, seconds):
+        st = self.stages.setdefault(stage, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+        st["count"] += 1
+        st["total_s"] += seconds
+        st["max_s"] = max(st["max_s"], seconds)
+        if self._prom:
+            self._prom["stage"].labels(stage).observe(seconds)
+
+    def error(self, stage, exc):
+        key = (stage, type(exc).__name__)
+        self.errors[key] = self.errors.get(key, 0) + 1
+        if self._prom:
+            self._prom["errors"].labels(*key).inc()
+
+    def page(self, page_type, mode="tab"):
+        key = (page_type, mode)
+        self.pages[key] = self.pages.get(key, 0) + 1
+        if self._prom:
+            self._prom["pages"].labels(*key).inc()
+
+    def add_bytes(self, source, n):
+        if not n:
+            return
+        self.bytes[source] = self.bytes.get(source, 0) + n
+        if self._prom:
+            self._prom["bytes"].labels(source).inc(n)
+
+    def set_concurrency(self, limit):
+        self.concurrency = limit
+        if self._prom:
+            self._prom["concurrency"].set(limit)
+
+    @contextmanager
+    def span(self, stage):
+        t0 = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.error(stage, e)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - t0)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        pages = sum(self.pages.values())
+        return {
+            "stages": {
+                stage: {
+                    **st,
+                    "avg_ms": round(st["total_s"] / st["count"] * 1000, 1) if st["count"] else 0.0,
+                }
+                for stage, st in self.stages.items()
+            },
+            "errors": {f"{stage}:{kind}": n for (stage, kind), n in self.errors.items()},
+            "pages": pages,
+            "pages_per_s": round(pages / elapsed, 2) if elapsed > 0 else 0.0,
+            "mb": {source: round(n / 1024 / 1024, 1) for source, n in self.bytes.items()},
+            "concurrency": self.concurrency,
+        }
+
+
+metrics = StageMetrics()
+span = metrics.span
+
+
+def watch_bytes(page, source="tab"):
+    # content-length van elke response; geen extra round trip naar de browser
+    def on_response(response):
+        try:
+            metrics.add_bytes(source, int(response.headers.get("content-length") or 0))
+        except (ValueError, TypeError):
+            pass
+
+    page.on("response", on_response)
+
+
+# -----------------------------
+# Endpoint
+# -----------------------------
+_server_port = None
+
+
+def start_metrics_server(port, addr="127.0.0.1"):
+    global _server_port
+    if not port or _server_port is not None:
+        return False
+    if prometheus_client is None:
+        logger.warning("METRICS_DISABLED | reason=prometheus_client not installed")
+        return False
+
+    prometheus_client.start_http_server(port, addr=addr)
+    _server_port = port
+    logger.info(f"METRICS_SERVER | url=http://{addr}:{port}/metrics")
+    return True
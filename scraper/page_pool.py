@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+
+from scraper.routes import ROUTE_POLICIES, apply_route_policy
+from scraper.metrics import watch_bytes
+from scraper.adaptive import fetch_timer
+
+logger = logging.getLogger("scraper")
+
+
+# -----------------------------
+# Page pool
+# -----------------------------
+# Warme tabs worden hergebruikt i.p.v. per video/profiel een nieuwe tab te
+# openen en te sluiten. Na gebruik gaat een tab naar about:blank (stopt video,
+# timers, etc.). Na `max_uses` keer of na een fout wordt hij vervangen.
+class PagePool:
+    def __init__(self, context, max_pages=4, max_uses=50, reset_url="about:blank"):
+        self.context = context
+        self.max_pages = max_pages
+        self.max_uses = max_uses
+        self.reset_url = reset_url
+
+        self._sem = asyncio.Semaphore(max_pages)
+        self._idle = []
+        self._uses = {}
+        self._route_policy = {}  # page -> route policy die erop staat
+
+        self.created = 0
+        self.recycled = 0
+        self.leases = 0
+
+    async def _new_page(self):
+        page = await self.context.new_page()
+        watch_bytes(page)
+        self.created += 1
+        self._uses[page] = 0
+        return page
+
+    async def _discard(self, page):
+        self._uses.pop(page, None)
+        self._route_policy.pop(page, None)
+        self.recycled += 1
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    async def _prepare(self, page, page_type):
+        # alleen opnieuw routen als de policy echt anders is: video en profiel
+        # delen DETAIL_POLICY, dus een wissel tussen die twee kost niets
+        policy = ROUTE_POLICIES.get(page_type)
+        if page in self._route_policy and self._route_policy[page] is policy:
+            return
+        if self._route_policy.get(page) is not None:
+            await page.unroute("**/*")
+        await apply_route_policy(page, page_type)
+        self._route_policy[page] = policy
+
+    async def acquire(self, page_type):
+        await self._sem.acquire()
+        try:
+            page = None
+            while self._idle and page is None:
+                candidate = self._idle.pop()
+                if candidate.is_closed():
+                    await self._discard(candidate)
+                else:
+                    page = candidate
+            if page is None:
+                page = await self._new_page()
+
+            await self._prepare(page, page_type)
+            self._uses[page] += 1
+            self.leases += 1
+            return page
+        except Exception:
+            self._sem.release()
+            raise
+
+    async def release(self, page, broken=False):
+        try:
+            if broken or page.is_closed() or self._uses.get(page, 0) >= self.max_uses:
+                await self._discard(page)
+                return
+            try:
+                await page.goto(self.reset_url)
+            except Exception:
+                await self._discard(page)
+                return
+            self._idle.append(page)
+        finally:
+            self._sem.release()
+
+    @asynccontextmanager
+    async def page(self, page_type):
+        page = await self.acquire(page_type)
+        broken = False
+        try:
+            yield page
+        except BaseException:
+            broken = True
+            raise
+        finally:
+            await self.release(page, broken)
+
+    def grow(self, max_pages):
+        # nooit krimpen; extra permits vrijgeven zodat wachtende leases meteen door kunnen
+        if max_pages <= self.max_pages:
+            return False
+        logger.info(f"PAGE_POOL_RESIZE | from={self.max_pages} | to={max_pages}")
+        for _ in range(max_pages - self.max_pages):
+            self._sem.release()
+        self.max_pages = max_pages
+        return True
+
+    async def close(self):
+        while self._idle:
+            await self._discard(self._idle.pop())
+        logger.info(
+            f"PAGE_POOL_CLOSED | created={self.created} | leases={self.leases} | recycled={self.recycled}"
+        )
+
+    def summary(self):
+        return {
+            "created": self.created,
+            "leases": self.leases,
+            "recycled": self.recycled,
+            "idle": len(self._idle),
+        }
+
+
+# -----------------------------
+# Pool per context
+# -----------------------------
+_pools = weakref.WeakKeyDictionary()
+
+
+def get_page_pool(context, max_pages=4, max_uses=50):
+    pool = _pools.get(context)
+    if pool is None:
+        pool = _pools[context] = PagePool(context, max_pages, max_uses)
+    else:
+        pool.grow(max_pages)
+    return pool
+
+
+@asynccontextmanager
+async def lease_page(context, page_type, pool_size=None, max_uses=50):
+    # pool_size None/0 = oude gedrag: nieuwe tab per gebruik
+    # fetch_timer pas na de lease: wachten op een vrije tab is geen latency
+    if pool_size:
+        async with get_page_pool(context, pool_size, max_uses).page(page_type) as page:
+            with fetch_timer():
+                yield page
+        return
+
+    page = await context.new_page()
+    watch_bytes(page)
+    try:
+        await apply_route_policy(page, page_type)
+        with fetch_timer():
+            yield page
+    finally:
+        await page.close()
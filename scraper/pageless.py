@@ -0,0 +1,93 @@
+from scraper.metrics import metrics
+
+
+# -----------------------------
+# Rehydration script scanner
+# -----------------------------
+# Zoekt in (stukken) HTML naar de <script id="__UNIVERSAL_DATA_FOR_REHYDRATION__">
+# tag en houdt alleen de inhoud daarvan vast. Zodra de sluit-tag gezien is
+# stopt de scanner, de rest van de HTML wordt niet meer bekeken.
+SCRIPT_ID = b'id="__UNIVERSAL_DATA_FOR_REHYDRATION__"'
+SCRIPT_END = b"</script>"
+
+
+class RehydrationScanner:
+    def __init__(self):
+        self._buf = b""
+        self._inside = False
+        self._parts = []
+        self.done = False
+
+    def feed(self, chunk: bytes):
+        if self.done:
+            return True
+
+        data = self._buf + chunk
+        self._buf = b""
+
+        if not self._inside:
+            i = data.find(SCRIPT_ID)
+            if i == -1:
+                # staart bewaren voor een id die over de chunk-grens valt
+                self._buf = data[-len(SCRIPT_ID):]
+                return False
+            j = data.find(b">", i)
+            if j == -1:
+                self._buf = data[i:]
+                return False
+            self._inside = True
+            data = data[j + 1:]
+
+        k = data.find(SCRIPT_END)
+        if k == -1:
+            keep = len(SCRIPT_END) - 1
+            self._parts.append(data[:-keep] if len(data) > keep else b"")
+            self._buf = data[-keep:] if len(data) > keep else data
+            return False
+
+        self._parts.append(data[:k])
+        self.done = True
+        return True
+
+    def result(self):
+        # ruwe bytes; json decoders (ook msgspec/orjson) lezen utf-8 bytes direct
+        if not self.done:
+            return None
+        return b"".join(self._parts)
+
+
+def extract_rehydration_raw(html, chunk_size=64 * 1024):
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+
+    scanner = RehydrationScanner()
+    for start in range(0, len(html), chunk_size):
+        if scanner.feed(html[start:start + chunk_size]):
+            break
+
+    return scanner.result()
+
+
+# -----------------------------
+# HTTP fetch via de browser context
+# -----------------------------
+# context.request deelt cookies met de ingelogde sessie, dus geen tab nodig.
+HTML_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+
+async def fetch_rehydration_raw(context, url, timeout=30000):
+    try:
+        resp = await context.request.get(url, headers=HTML_HEADERS, timeout=timeout)
+    except Exception:
+        return None
+
+    try:
+        if not resp.ok:
+            return None
+        body = await resp.body()
+        metrics.add_bytes("pageless", len(body))
+        return extract_rehydration_raw(body)
+    finally:
+        await resp.dispose()
@@ -0,0 +1,277 @@
+import time
+import asyncio
+import logging
+
+from logger import log_event
+import scraper.search as search
+from scraper.search import (
+    discover_video_items,
+    fetch_item_video_data,
+    fetch_item_profile,
+    build_record,
+    get_journal,
+    load_journal_state,
+    get_seen_index,
+    profile_cache,
+)
+from scraper.metrics import span, start_metrics_server
+from scraper.single_flight import MISS
+
+logger = logging.getLogger("scraper")
+
+_DONE = object()
+
+
+# -----------------------------
+# Stage stats
+# -----------------------------
+class StageStats:
+    def __init__(self, name, queue=None):
+        self.name = name
+        self.queue = queue
+        self.processed = 0
+        self.errors = 0
+        self.busy_s = 0.0
+        self.max_depth = 0
+
+    def sample(self):
+        if self.queue is not None:
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def summary(self):
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "busy_s": round(self.busy_s, 2),
+            "depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_depth": self.max_depth,
+        }
+
+
+# -----------------------------
+# Staged pipeline
+# -----------------------------
+# discover -> video -> profile -> write, met begrensde queues ertussen.
+# Video fetches starten zodra de eerste kaarten in het grid staan en records
+# worden al weggeschreven terwijl er nog profielen opgehaald worden. Zit een
+# queue vol, dan wacht de stage ervoor (backpressure), tot en met het scrollen.
+class KeywordPipeline:
+    def __init__(self, search_page, keyword, max_videos=None, sink=None,
+                 video_workers=None, profile_workers=None, queue_size=20, resume=None):
+        self.search_page = search_page
+        self.context = search_page.context
+        self.keyword = keyword
+        self.max_videos = max_videos
+        self.sink = sink
+        self.video_workers = video_workers or search.CONCURRENCY
+        self.profile_workers = profile_workers or search.CONCURRENCY
+        self.resume = resume
+
+        self.video_q = asyncio.Queue(queue_size)
+        self.profile_q = asyncio.Queue(queue_size)
+        self.write_q = asyncio.Queue(queue_size)
+
+        self.stages = {
+            "discover": StageStats("discover"),
+            "video": StageStats("video", self.video_q),
+            "profile": StageStats("profile", self.profile_q),
+            "write": StageStats("write", self.write_q),
+        }
+        self.results = []
+        self.journal = get_journal()
+        self.seen_index = get_seen_index()
+        self._claimed = set()  # video_ids die deze pipeline ophaalt (seen_index.flight)
+
+    def stats(self):
+        return {name: st.summary() for name, st in self.stages.items()}
+
+    # -----------------------------
+    # Stages
+    # -----------------------------
+    async def _discover(self):
+        st = self.stages["discover"]
+        t0 = time.perf_counter()
+
+        async def on_items(items):
+            for item in items:
+                if not item["username"]:
+                    continue
+                await self.video_q.put(item)
+                st.processed += 1
+                self.stages["video"].sample()
+
+        try:
+            items, done = load_journal_state(self.journal, self.keyword, self.resume)
+
+            if items is None:
+                items = await discover_video_items(
+                    self.search_page, self.keyword, self.max_videos, on_items=on_items
+                )
+                if self.journal:
+                    self.journal.save_items(self.keyword, items)
+            else:
+                # al afgeronde records uit de onderbroken run gaan direct naar de writer
+                for item in items:
+                    record = done.get(item["video_id"])
+                    if record and search.RESUME_WRITE_DONE:
+                        await self.write_q.put(("record", item, record))
+                    elif record:
+                        self.results.append(record)
+                await on_items([it for it in items if it["video_id"] not in done])
+        finally:
+            st.busy_s += time.perf_counter() - t0
+            for _ in range(self.video_workers):
+                await self.video_q.put(_DONE)
+
+    async def _video_worker(self):
+        st = self.stages["video"]
+        while True:
+            item = await self.video_q.get()
+            if item is _DONE:
+                return
+
+            t0 = time.perf_counter()
+            try:
+                video_id = item["video_id"]
+                self.seen_index.add_match(video_id, self.keyword, item["idx"])
+                # al opgehaald, of nu onderweg bij een ander keyword: daarop wachten
+                reused = await self.seen_index.flight.wait(video_id, lambda: self.seen_index.get(video_id))
+                if reused is not MISS and reused:
+                    self.seen_index.hits += 1
+                    payload = ("record", item, {**reused, "keyword": self.keyword})
+                    next_q = self.write_q
+                else:
+                    # claim loopt tot de writer (resolve) of _failed (fail)
+                    self.seen_index.flight.claim(video_id)
+                    self._claimed.add(video_id)
+                    self.seen_index.misses += 1
+                    video_data = await fetch_item_video_data(self.context, item)
+                    payload = ("video", item, video_data)
+                    next_q = self.profile_q
+                st.processed += 1
+            except Exception as e:
+                st.errors += 1
+                self._failed(item, e)
+                continue
+            finally:
+                st.busy_s += time.perf_counter() - t0
+
+            if next_q is self.write_q:
+                await self.write_q.put(payload)
+                self.stages["write"].sample()
+            else:
+                await self.profile_q.put(payload)
+                self.stages["profile"].sample()
+
+    async def _profile_worker(self):
+        st = self.stages["profile"]
+        while True:
+            payload = await self.profile_q.get()
+            if payload is _DONE:
+                return
+
+            _, item, video_data = payload
+            t0 = time.perf_counter()
+            try:
+                profile = await fetch_item_profile(self.context, item)
+                record = build_record(self.keyword, item, video_data, profile)
+                st.processed += 1
+            except Exception as e:
+                st.errors += 1
+                self._failed(item, e)
+                continue
+            finally:
+                st.busy_s += time.perf_counter() - t0
+
+            await self.write_q.put(("record", item, record))
+            self.stages["write"].sample()
+
+    async def _writer(self):
+        st = self.stages["write"]
+        while True:
+            payload = await self.write_q.get()
+            if payload is _DONE:
+                return
+
+            _, item, record = payload
+            t0 = time.perf_counter()
+            try:
+                if self.sink:
+                    with span("write"):
+                        self.sink.write(record)
+                self.seen_index.put(item["video_id"], record)
+                self._release(item["video_id"], record=record)
+                if self.journal:
+                    self.journal.mark_done(self.keyword, item["video_id"], record)
+                self.results.append(record)
+                st.processed += 1
+            except Exception as e:
+                st.errors += 1
+                self._release(item["video_id"], error=e)
+                logger.error(f"WRITE_ERROR | kw={self.keyword} | idx={item['idx']} | error={e}")
+            finally:
+                st.busy_s += time.perf_counter() - t0
+
+    def _release(self, video_id, record=None, error=None):
+        if video_id not in self._claimed:
+            return
+        self._claimed.discard(video_id)
+        if error is not None:
+            self.seen_index.flight.fail(video_id, error)
+        else:
+            self.seen_index.flight.resolve(video_id, record)
+
+    def _failed(self, item, error):
+        self._release(item["video_id"], error=error)
+        log_event(
+            logger, "VIDEO_ERROR", logging.ERROR,
+            keyword=self.keyword, video_id=item["video_id"], idx=item["idx"], error=error,
+        )
+        if self.journal:
+            self.journal.mark_failed(self.keyword, item["video_id"], error)
+
+    # -----------------------------
+    # Run
+    # -----------------------------
+    async def run(self):
+        t0 = time.perf_counter()
+        start_metrics_server(search.METRICS_PORT)
+        # video en profiel workers houden elk een eigen tab vast
+        search.reserve_pages(self.context, self.video_workers + self.profile_workers)
+
+        async def video_stage():
+            await asyncio.gather(*(self._video_worker() for _ in range(self.video_workers)))
+            for _ in range(self.profile_workers):
+                await self.profile_q.put(_DONE)
+
+        async def profile_stage():
+            await asyncio.gather(*(self._profile_worker() for _ in range(self.profile_workers)))
+            await self.write_q.put(_DONE)
+
+        try:
+            await asyncio.gather(self._discover(), video_stage(), profile_stage(), self._writer())
+        finally:
+            # afgebroken run: andere keywords mogen niet op onze claims blijven wachten
+            for video_id in self._claimed:
+                self.seen_index.flight.abandon(video_id)
+            self._claimed.clear()
+            profile_cache.flush()
+
+        if self.journal:
+            self.journal.mark_complete(self.keyword)
+        elapsed = time.perf_counter() - t0
+        for name, st in self.stats().items():
+            logger.info(
+                f"PIPELINE_STATS | keyword={self.keyword} | stage={name} | processed={st['processed']} | "
+                f"errors={st['errors']} | busy_s={st['busy_s']} | max_depth={st['max_depth']}"
+            )
+        search.log_keyword_stats(self.keyword, len(self.results), elapsed, self.video_workers)
+        return self.results
+
+
+async def run_keyword_pipeline(search_page, keyword, max_videos=None, sink=None,
+                               video_workers=None, profile_workers=None, queue_size=20):
+    pipeline = KeywordPipeline(
+        search_page, keyword, max_videos, sink, video_workers, profile_workers, queue_size
+    )
+    return await pipeline.run()
@@ -0,0 +1,146 @@
+import os
+import json
+import time
+from pathlib import Path
+
+from scraper.single_flight import SingleFlight
+
+
+# -----------------------------
+# Profile cache
+# -----------------------------
+# Per username wordt het profiel (bio, bio_links, profile_stats) maar 1x opgehaald.
+# Gelijktijdige lookups voor dezelfde auteur wachten op dezelfde fetch.
+# Optioneel gaat elk nieuw profiel als één regel naar een append-only JSONL
+# log, zodat een volgende run auteurs overslaat die nog niet ouder zijn dan de
+# TTL. Een put kost zo één regel schrijven i.p.v. het hele bestand; het log
+# wordt alleen herschreven (compact) als het veel verouderde regels bevat.
+class ProfileCache:
+    def __init__(self, path=None, ttl=7 * 24 * 3600, max_entries=50000, flush_every=25):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+
+        # username -> {"ts": float, "data": dict}, in volgorde van ts (oudste eerst)
+        self._entries = {}
+        self._flight = SingleFlight()
+        self._dirty = 0
+        self._lines = 0      # regels in het log, incl. verouderde
+        self._log = None
+
+        self.hits = 0
+        self.misses = 0
+
+        if self.path and self.path.exists():
+            self._load()
+
+    # -----------------------------
+    # Disk tier
+    # -----------------------------
+    def _load(self):
+        now = time.time()
+        loaded = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue  # half geschreven laatste regel
+                    self._lines += 1
+                    if now - row.get("ts", 0) < self.ttl:
+                        loaded[row["u"]] = {"ts": row["ts"], "data": row["data"]}
+        except OSError:
+            return
+
+        for username in sorted(loaded, key=lambda u: loaded[u]["ts"]):
+            self._entries[username] = loaded[username]
+        self._evict()
+
+    def _append(self, username, entry):
+        if self._log is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._log = open(self.path, "a", encoding="utf-8")
+        self._log.write(json.dumps({"u": username, **entry}, ensure_ascii=False) + "\n")
+        self._lines += 1
+        self._dirty += 1
+        if self._dirty >= self.flush_every:
+            self._log.flush()
+            self._dirty = 0
+
+    def flush(self):
+        # einde keyword/run: log naar disk, en compacten als het log vooral oude regels bevat
+        if not self.path:
+            return
+        if self._log is not None:
+            self._log.flush()
+        self._dirty = 0
+
+        if self._lines > 2 * len(self._entries) + 1000:
+            self.compact()
+
+    def compact(self):
+        # herschrijf het log met alleen de actuele entries (atomisch via tmp)
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        lines = 0
+        with open(tmp, "w", encoding="utf-8") as f:
+            for username, entry in self._entries.items():
+                if entry["data"].get("profile_stats"):
+                    f.write(json.dumps({"u": username, **entry}, ensure_ascii=False) + "\n")
+                    lines += 1
+        os.replace(tmp, self.path)
+        self._lines = lines
+
+    def _evict(self):
+        # entries staan op ts volgorde: de oudste staan vooraan
+        now = time.time()
+        while self._entries:
+            username = next(iter(self._entries))
+            entry = self._entries[username]
+            if len(self._entries) <= self.max_entries and now - entry["ts"] < self.ttl:
+                break
+            del self._entries[username]
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+    def get(self, username, max_age=None):
+        entry = self._entries.get(username)
+        if not entry:
+            return None
+        max_age = self.ttl if max_age is None else max_age
+        if time.time() - entry["ts"] >= max_age:
+            return None
+        return entry["data"]
+
+    def put(self, username, data):
+        # mislukte lookups (lege profile_stats) niet cachen, ook niet in memory:
+        # anders blanco't één tijdelijke fout de auteur voor de hele TTL
+        if not data or not data.get("profile_stats"):
+            return
+        entry = {"ts": time.time(), "data": data}
+        # opnieuw invoegen zodat de volgorde van _entries op ts blijft
+        self._entries.pop(username, None)
+        self._entries[username] = entry
+        self._evict()
+        if self.path:
+            self._append(username, entry)
+
+    async def get_or_fetch(self, username, fetch, max_age=None):
+        async def fetch_and_put():
+            data = await fetch(username)
+            self.put(username, data)
+            return data
+
+        data, reused = await self._flight.do(username, lambda: self.get(username, max_age), fetch_and_put)
+        if reused:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return data
@@ -0,0 +1,105 @@
+import time
+
+
+# -----------------------------
+# Readiness checks per page type
+# -----------------------------
+# In plaats van een vaste wait_for_timeout wachten we tot de data die we nodig
+# hebben in de pagina staat. Lukt dat niet binnen de cap (= de oude vaste
+# wachttijd) dan gaan we gewoon door, net als vroeger.
+HAS_REHYDRATION = (
+    "(window.__UNIVERSAL_DATA__ || "
+    "document.querySelector('#__UNIVERSAL_DATA_FOR_REHYDRATION__')?.textContent)"
+)
+
+READY_CHECKS = {
+    "video": f"() => !!{HAS_REHYDRATION}",
+    "profile": (
+        f"() => !!{HAS_REHYDRATION} && "
+        "!!document.querySelector(\"h2[data-e2e='user-bio'], strong[data-e2e='followers-count']\")"
+    ),
+    "search": "() => !!document.querySelector(\"button[data-testid='tux-web-tab-bar']\")",
+}
+
+# oude vaste wachttijden (ms), gebruikt als cap en als fallback
+FALLBACK_MS = {
+    "video": 5000,
+    "profile": 3500,
+    "search": 3000,
+    "scroll": 1500,
+}
+
+READINESS_ENABLED = True  # False = terug naar de vaste sleeps
+
+
+# -----------------------------
+# Time-to-ready stats
+# -----------------------------
+class ReadyStats:
+    def __init__(self):
+        self.stats = {}
+
+    def record(self, page_type, elapsed_ms, ready):
+        s = self.stats.setdefault(page_type, {
+            "count": 0, "ready": 0, "timeouts": 0,
+            "total_ms": 0.0, "max_ms": 0.0, "saved_ms": 0.0,
+        })
+        s["count"] += 1
+        s["ready" if ready else "timeouts"] += 1
+        s["total_ms"] += elapsed_ms
+        s["max_ms"] = max(s["max_ms"], elapsed_ms)
+        s["saved_ms"] += max(0.0, FALLBACK_MS.get(page_type, 0) - elapsed_ms)
+
+    def summary(self):
+        out = {}
+        for page_type, s in self.stats.items():
+            out[page_type] = {
+                **s,
+                "avg_ms": round(s["total_ms"] / s["count"], 1) if s["count"] else 0.0,
+            }
+        return out
+
+
+ready_stats = ReadyStats()
+
+
+# -----------------------------
+# Wait helpers
+# -----------------------------
+async def _wait(page, page_type, expression, arg=None, cap_ms=None):
+    cap_ms = cap_ms if cap_ms is not None else FALLBACK_MS[page_type]
+
+    if not READINESS_ENABLED:
+        await page.wait_for_timeout(cap_ms)
+        ready_stats.record(page_type, cap_ms, False)
+        return False
+
+    t0 = time.perf_counter()
+    try:
+        await page.wait_for_function(expression, arg=arg, timeout=cap_ms, polling=100)
+        ready = True
+    except Exception:
+        ready = False
+
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    ready_stats.record(page_type, elapsed_ms, ready)
+    return ready
+
+
+async def wait_until_ready(page, page_type, cap_ms=None):
+    return await _wait(page, page_type, READY_CHECKS[page_type], cap_ms=cap_ms)
+
+
+async def wait_for_condition(page, page_type, expression, arg=None, cap_ms=None):
+    return await _wait(page, page_type, expression, arg=arg, cap_ms=cap_ms)
+
+
+async def wait_for_more(page, selector, previous_count, cap_ms=None):
+    # wacht tot er meer dan previous_count elementen op selector matchen
+    return await _wait(
+        page,
+        "scroll",
+        "([sel, n]) => document.querySelectorAll(sel).length > n",
+        arg=[selector, previous_count],
+        cap_ms=cap_ms,
+    )
@@ -0,0 +1,156 @@
+import csv
+import json
+import time
+import asyncio
+import logging
+from pathlib import Path
+
+import scraper.search as search
+from scraper.search import fetch_video_stats, fetch_profile, profile_cache
+from scraper.sinks import open_sink
+from scraper.metrics import span
+
+logger = logging.getLogger("scraper")
+
+PROFILE_MAX_AGE = 24 * 3600  # profielen alleen opnieuw ophalen als de cache ouder is
+
+
+# -----------------------------
+# Known videos uit eerdere output
+# -----------------------------
+def _video_id_from_url(url):
+    if url and "/video/" in url:
+        return url.split("/video/")[1].split("?")[0]
+    return None
+
+
+def _read_csv(path, encoding=None):
+    # CsvSink schrijft utf-8(-sig); de cp1252 fallback is voor oudere CSV's
+    # die via Excel opnieuw opgeslagen/geexporteerd zijn
+    for enc in [encoding] if encoding else ["utf-8-sig", "cp1252"]:
+        try:
+            with open(path, encoding=enc, newline="") as f:
+                return list(csv.DictReader(f, delimiter=";"))
+        except UnicodeDecodeError:
+            if encoding:
+                raise
+    raise ValueError(f"Could not decode {path}")
+
+
+def load_known_videos(path, encoding=None):
+    # leest JSONL / CSV (;) / Parquet output en geeft unieke videos terug
+    # encoding: alleen voor CSV, None = utf-8 met fallback naar cp1252
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    elif suffix == ".csv":
+        rows = _read_csv(path, encoding)
+    elif suffix == ".parquet":
+        import pyarrow.parquet as pq
+        rows = pq.read_table(path, columns=["keyword", "video_id", "video_url", "author"]).to_pylist()
+    else:
+        raise ValueError(f"Unknown input format: {path}")
+
+    known = {}
+    for row in rows:
+        url = row.get("video_url")
+        # video_id uit de url: in oude CSV's is de kolom soms kapot (7,59E+18)
+        video_id = _video_id_from_url(url) or row.get("video_id")
+        if not url or not video_id or video_id in known:
+            continue
+        known[video_id] = {
+            "video_id": str(video_id),
+            "video_url": url,
+            "author": row.get("author"),
+            "keyword": row.get("keyword"),
+        }
+    return list(known.values())
+
+
+# -----------------------------
+# Refresh
+# -----------------------------
+async def refresh_video(context, known, profile_max_age=PROFILE_MAX_AGE):
+    video_data = await fetch_video_stats(context, known["video_url"], known["video_id"])
+    stats = video_data.get("stats") or {}
+
+    profile = {}
+    if known.get("author"):
+        profile = await profile_cache.get_or_fetch(
+            known["author"],
+            lambda username: fetch_profile(context, username),
+            max_age=profile_max_age,
+        )
+
+    return {
+        "snapshot_at": int(time.time()),
+        "keyword": known.get("keyword"),
+        "video_id": known["video_id"],
+        "video_url": known["video_url"],
+        "views": stats.get("views"),
+        "likes": stats.get("likes"),
+        "comments": stats.get("comments"),
+        "shares": stats.get("shares"),
+        "saves": stats.get("saves"),
+        "author": known.get("author"),
+        "profile_bio": profile.get("profile_bio"),
+        "bio_links": profile.get("bio_links") or [],
+        "profile_stats": profile.get("profile_stats") or {},
+    }
+
+
+async def iter_refresh(context, known_videos, concurrency=None, profile_max_age=PROFILE_MAX_AGE):
+    concurrency = max(1, concurrency or search.CONCURRENCY)
+    sem = asyncio.Semaphore(concurrency)
+    search.reserve_pages(context, concurrency)
+
+    async def worker(known):
+        async with sem:
+            try:
+                return await refresh_video(context, known, profile_max_age)
+            except Exception as e:
+                logger.error(f"REFRESH_ERROR | id={known['video_id']} | error={e}")
+                return None
+
+    tasks = [asyncio.ensure_future(worker(k)) for k in known_videos]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            snapshot = await fut
+            if snapshot:
+                yield snapshot
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def refresh(context, source_path, out_path, concurrency=None, profile_max_age=PROFILE_MAX_AGE,
+                  encoding=None):
+    # snapshots worden achteraan toegevoegd aan out_path, nooit overschreven
+    known_videos = load_known_videos(source_path, encoding)
+    logger.info(f"REFRESH_START | source={source_path} | videos={len(known_videos)}")
+
+    # Parquet/Arrow kunnen niet appenden: elke refresh wordt een eigen bestand
+    out_path = Path(out_path)
+    if out_path.suffix.lower() in (".parquet", ".arrow", ".feather"):
+        out_path = out_path.with_name(f"{out_path.stem}-{int(time.time())}{out_path.suffix}")
+
+    t0 = time.perf_counter()
+    count = 0
+    sink = open_sink(out_path)
+    try:
+        async for snapshot in iter_refresh(context, known_videos, concurrency, profile_max_age):
+            with span("write"):
+                sink.write(snapshot)
+            count += 1
+    finally:
+        sink.close()
+        profile_cache.flush()
+
+    logger.info(
+        f"REFRESH_DONE | snapshots={count} | duration={time.perf_counter() - t0:.2f}s | "
+        f"profile_hits={profile_cache.hits} | profile_misses={profile_cache.misses}"
+    )
+    return count
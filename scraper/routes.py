@@ -0,0 +1,91 @@
+# -----------------------------
+# Route policies per page type
+# -----------------------------
+# Op video- en profielpagina's lezen we alleen de rehydration JSON en een paar
+# DOM elementen. Video streams, plaatjes, fonts en tracking scripts hoeven dus
+# niet geladen te worden. De zoekpagina laten we met rust (daar scrollen we).
+ANALYTICS_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "mon.tiktokv.com",
+    "mon-va.tiktokv.com",
+    "mcs.tiktokv.com",
+    "mcs-va.tiktokv.com",
+    "log.tiktokv.com",
+    "analytics.tiktok.com",
+)
+
+DETAIL_POLICY = {
+    "block_types": {"media", "image", "font", "texttrack", "eventsource", "manifest"},
+    "block_hosts": ANALYTICS_HOSTS,
+}
+
+ROUTE_POLICIES = {
+    "video": DETAIL_POLICY,
+    "profile": DETAIL_POLICY,
+    "search": None,
+}
+
+# geschatte gemiddelde grootte per geblokkeerd request (bytes); een
+# geaborte request heeft geen response, dus echte bytes zijn niet bekend
+EST_BYTES = {
+    "media": 1_500_000,
+    "image": 60_000,
+    "font": 40_000,
+    "script": 80_000,
+}
+EST_BYTES_DEFAULT = 5_000
+
+
+# -----------------------------
+# Counters
+# -----------------------------
+class RouteStats:
+    def __init__(self):
+        self.blocked = {}
+        self.allowed = 0
+        self.est_bytes_saved = 0
+
+    def record_block(self, resource_type):
+        self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+        self.est_bytes_saved += EST_BYTES.get(resource_type, EST_BYTES_DEFAULT)
+
+    def summary(self):
+        return {
+            "blocked": sum(self.blocked.values()),
+            "blocked_by_type": dict(self.blocked),
+            "allowed": self.allowed,
+            "est_mb_saved": round(self.est_bytes_saved / 1024 / 1024, 1),
+        }
+
+
+route_stats = RouteStats()
+
+
+def _should_block(request, policy):
+    if request.resource_type in policy["block_types"]:
+        return True
+    url = request.url
+    return any(host in url for host in policy["block_hosts"])
+
+
+async def apply_route_policy(page, page_type):
+    policy = ROUTE_POLICIES.get(page_type)
+    if not policy:
+        return
+
+    async def handler(route):
+        request = route.request
+        try:
+            if _should_block(request, policy):
+                route_stats.record_block(request.resource_type)
+                await route.abort()
+            else:
+                route_stats.allowed += 1
+                await route.continue_()
+        except Exception:
+            # pagina al dicht / route al afgehandeld
+            pass
+
+    await page.route("**/*", handler)
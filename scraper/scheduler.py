@@ -0,0 +1,99 @@
+import time
+import asyncio
+import logging
+
+from scraper.search import iter_keyword_results, reserve_pages
+from scraper.adaptive import AdaptiveLimiter
+
+logger = logging.getLogger("scraper")
+
+
+# -----------------------------
+# Multi-keyword scheduler
+# -----------------------------
+# `keyword_concurrency` keywords lopen tegelijk, elk met een eigen zoek-tab in
+# dezelfde (ingelogde) context. Alle video/profiel fetches van alle keywords
+# delen één globaal budget (`max_inflight`). asyncio.Semaphore laat wachtende
+# taken in FIFO volgorde door, dus een keyword met 300 videos kan de rest
+# niet uithongeren: elk keyword staat met zijn volgende item in dezelfde rij.
+# `per_keyword` is standaard het hele budget, zodat slots die vrijkomen als er
+# minder keywords over zijn gewoon door de overgebleven keywords benut worden.
+async def run_keywords(
+    context,
+    keywords,
+    keyword_concurrency=3,
+    max_inflight=6,
+    per_keyword=None,
+    max_videos=None,
+    sink=None,
+    progress_every=25,
+    adaptive=False,
+):
+    # adaptive: AIMD limiter i.p.v. een vast budget; max_inflight is dan de bovengrens
+    if adaptive:
+        limiter = AdaptiveLimiter(initial=max(1, max_inflight // 2), max_limit=max_inflight)
+    else:
+        limiter = asyncio.Semaphore(max_inflight)
+    per_keyword = per_keyword or max_inflight
+    # alle keywords delen de page pool van de context
+    reserve_pages(context, max_inflight)
+
+    queue = asyncio.Queue()
+    for kw in keywords:
+        queue.put_nowait(kw)
+
+    report = {}
+
+    async def run_one(search_page, keyword):
+        t0 = time.perf_counter()
+        stats = report[keyword] = {"status": "running", "results": 0, "duration": None}
+        logger.info(f"KEYWORD_START | keyword={keyword}")
+
+        try:
+            async for _ in iter_keyword_results(
+                search_page, keyword, max_videos, per_keyword, sink, limiter=limiter
+            ):
+                stats["results"] += 1
+                if stats["results"] % progress_every == 0:
+                    logger.info(
+                        f"KEYWORD_PROGRESS | keyword={keyword} | results={stats['results']} | "
+                        f"elapsed={time.perf_counter() - t0:.1f}s"
+                    )
+            stats["status"] = "ok"
+            logger.info(f"KEYWORD_OK | keyword={keyword} | results={stats['results']}")
+        except Exception as e:
+            stats["status"] = "error"
+            stats["error"] = str(e)
+            logger.error(f"KEYWORD_ERROR | keyword={keyword} | error={e}")
+        finally:
+            stats["duration"] = round(time.perf_counter() - t0, 2)
+            logger.info(f"KEYWORD_DONE | keyword={keyword} | duration={stats['duration']:.2f}s")
+
+    async def worker():
+        search_page = await context.new_page()
+        try:
+            while True:
+                try:
+                    keyword = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await run_one(search_page, keyword)
+        finally:
+            await search_page.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(keyword_concurrency, len(keywords)))))
+
+    total = sum(s["results"] for s in report.values())
+    elapsed = time.perf_counter() - t0
+    logger.info(
+        f"SCHEDULER_DONE | keywords={len(keywords)} | results={total} | duration={elapsed:.2f}s | "
+        f"errors={sum(1 for s in report.values() if s['status'] == 'error')}"
+    )
+    if adaptive:
+        st = limiter.summary()
+        logger.info(
+            f"ADAPTIVE_SUMMARY | limit={st['limit']} | min={st['min']} | max={st['max']} | "
+            f"adjustments={st['adjustments']} | history={st['history']}"
+        )
+    return report
@@ -0,0 +1,168 @@
+import os
+import json
+import math
+import atexit
+import tempfile
+import time
+import sqlite3
+import hashlib
+from pathlib import Path
+
+from scraper.single_flight import SingleFlight
+
+
+# -----------------------------
+# Bloom filter
+# -----------------------------
+# Vaste hoeveelheid geheugen (~1.2 MB voor 1M ids bij 1% false positives).
+# "Niet in de filter" is zeker nieuw, dan hoeft de exacte store niet geraadpleegd.
+class BloomFilter:
+    def __init__(self, capacity=1_000_000, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+# -----------------------------
+# Exact store
+# -----------------------------
+# Altijd op disk: records (desc, bio, links, stats) blijven niet in het geheugen
+# hangen, ook niet bij 100k+ ids. Zonder pad wordt een tijdelijk bestand
+# gebruikt dat aan het einde van de run weer verdwijnt.
+class SqliteStore:
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS videos (
+        video_id    TEXT PRIMARY KEY,
+        record_json TEXT NOT NULL,
+        fetched_at  REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS matches (
+        video_id TEXT NOT NULL,
+        keyword  TEXT NOT NULL,
+        idx      INTEGER,
+        PRIMARY KEY (video_id, keyword)
+    );
+    """
+
+    def __init__(self, path=None):
+        self.temporary = path is None
+        if self.temporary:
+            fd, path = tempfile.mkstemp(prefix="seen-", suffix=".sqlite")
+            os.close(fd)
+            atexit.register(self.close)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        if self.temporary:
+            # alleen voor deze run: geen fsync per record nodig
+            self.db.execute("PRAGMA synchronous = OFF")
+            self.db.execute("PRAGMA journal_mode = MEMORY")
+        self.db.executescript(self.SCHEMA)
+        self.db.commit()
+
+    def close(self):
+        if self.db is None:
+            return
+        self.db.close()
+        self.db = None
+        if self.temporary:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def ids(self):
+        return (r[0] for r in self.db.execute("SELECT video_id FROM videos"))
+
+    def get(self, video_id, max_age=None):
+        row = self.db.execute(
+            "SELECT record_json, fetched_at FROM videos WHERE video_id = ?", (video_id,)
+        ).fetchone()
+        if not row or (max_age is not None and time.time() - row[1] >= max_age):
+            return None
+        return json.loads(row[0])
+
+    def put(self, video_id, record):
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO videos (video_id, record_json, fetched_at) VALUES (?, ?, ?)",
+                (video_id, json.dumps(record, ensure_ascii=False), time.time()),
+            )
+
+    def add_match(self, video_id, keyword, idx):
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO matches (video_id, keyword, idx) VALUES (?, ?, ?)",
+                (video_id, keyword, idx),
+            )
+
+    def get_matches(self, video_id):
+        return self.db.execute(
+            "SELECT keyword, idx FROM matches WHERE video_id = ? ORDER BY keyword", (video_id,)
+        ).fetchall()
+
+
+# -----------------------------
+# Run-wide seen index
+# -----------------------------
+# Elke video wordt 1x opgehaald, ook als hij onder meerdere keywords in het
+# grid staat. Per video_id wordt bijgehouden bij welke keywords (en op welke
+# grid positie) hij gevonden is. Records ouder dan max_age (seconden, op
+# fetched_at) tellen niet als gezien, zodat een blijvende index (path gezet)
+# geen verouderde stats blijft hergebruiken.
+class SeenIndex:
+    def __init__(self, path=None, capacity=1_000_000, max_age=None):
+        self.max_age = max_age
+        self.store = SqliteStore(path)
+        self.bloom = BloomFilter(capacity)
+        for video_id in self.store.ids():
+            self.bloom.add(video_id)
+
+        self.flight = SingleFlight()  # ook gebruikt door de pipeline (claim/resolve)
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.store.close()
+
+    def get(self, video_id):
+        if video_id not in self.bloom:
+            return None
+        return self.store.get(video_id, self.max_age)
+
+    def put(self, video_id, record):
+        self.store.put(video_id, record)
+        self.bloom.add(video_id)
+
+    def add_match(self, video_id, keyword, idx):
+        self.store.add_match(video_id, keyword, idx)
+
+    def keywords_for(self, video_id):
+        return self.store.get_matches(video_id)
+
+    async def get_or_fetch(self, video_id, fetch):
+        async def fetch_and_put():
+            record = await fetch()
+            if record:
+                self.put(video_id, record)
+            return record
+
+        record, reused = await self.flight.do(video_id, lambda: self.get(video_id), fetch_and_put)
+        if reused:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return record, reused
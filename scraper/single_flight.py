@@ -0,0 +1,79 @@
+import asyncio
+
+
+# -----------------------------
+# Single-flight
+# -----------------------------
+# Per key loopt maar één fetch tegelijk; gelijktijdige lookups voor dezelfde
+# key wachten op die fetch i.p.v. zelf op te halen. Gedeeld door de profiel
+# cache en de seen index. Wordt de taak die de fetch doet gecanceld, dan
+# wordt de future ook gecanceld: wachtenden blijven niet hangen maar proberen
+# het zelf opnieuw.
+MISS = object()
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight = {}  # key -> asyncio.Future
+
+    async def wait(self, key, lookup):
+        # -> waarde uit lookup() of van een lopende fetch, anders MISS
+        while True:
+            value = lookup()
+            if value is not None:
+                return value
+
+            pending = self._inflight.get(key)
+            if not pending:
+                return MISS
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # de taak die de fetch deed is gecanceld: opnieuw kijken
+
+    async def do(self, key, lookup, fetch):
+        # -> (waarde, reused); reused = uit lookup() of van andermans fetch
+        value = await self.wait(key, lookup)
+        if value is not MISS:
+            return value, True
+
+        self.claim(key)
+        try:
+            value = await fetch()
+        except Exception as e:
+            self.fail(key, e)
+            raise
+        else:
+            self.resolve(key, value)
+            return value, False
+        finally:
+            # ook bij cancel: wachtende lookups mogen niet blijven hangen
+            self.abandon(key)
+
+    # -----------------------------
+    # Handmatig (fetch over meerdere stappen, zoals de pipeline)
+    # -----------------------------
+    # Na claim() altijd resolve(), fail() of abandon() aanroepen.
+    def claim(self, key):
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        return fut
+
+    def resolve(self, key, value):
+        fut = self._inflight.pop(key, None)
+        if fut is not None and not fut.done():
+            fut.set_result(value)
+
+    def fail(self, key, error):
+        fut = self._inflight.pop(key, None)
+        if fut is not None and not fut.done():
+            fut.set_exception(error)
+            # voorkom "exception was never retrieved" als niemand meewachtte
+            fut.exception()
+
+    def abandon(self, key):
+        fut = self._inflight.pop(key, None)
+        if fut is not None and not fut.done():
+            fut.cancel()
@@ -0,0 +1,277 @@
+import csv
+import json
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# -----------------------------
+# Output sinks
+# -----------------------------
+# Records worden direct bij binnenkomst weggeschreven en geflusht, zodat een
+# crash halverwege een keyword de al gescrapete resultaten niet kost.
+class JsonlSink:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "a", encoding="utf-8")
+        self.count = 0
+
+    def write(self, record):
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+        self.count += 1
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# utf-8 met BOM: houdt emoji in descriptions heel en Excel / de analyse
+# notebook (read_csv(..., sep=";", encoding="utf-8-sig")) herkennen het
+CSV_ENCODING = "utf-8-sig"
+
+# kolommen zoals in de analyse notebook
+CSV_COLUMNS = [
+    "keyword", "video_id", "video_url", "views", "likes", "comments", "shares", "saves",
+    "author", "followers", "following", "profile_likes", "total_videos",
+    "profile_bio", "video_desc", "hashtags", "bio_links", "create_time", "duration",
+    "snapshot_at",
+]
+
+
+def flatten_record(record):
+    stats = record.get("profile_stats") or {}
+    return {
+        "keyword": record.get("keyword"),
+        "video_id": record.get("video_id"),
+        "video_url": record.get("video_url"),
+        "views": record.get("views"),
+        "likes": record.get("likes"),
+        "comments": record.get("comments"),
+        "shares": record.get("shares"),
+        "saves": record.get("saves"),
+        "author": record.get("author"),
+        "followers": stats.get("followers"),
+        "following": stats.get("following"),
+        "profile_likes": stats.get("likes"),
+        "total_videos": stats.get("videos"),
+        "profile_bio": record.get("profile_bio"),
+        "video_desc": record.get("desc"),
+        "hashtags": ", ".join(record.get("hashtags") or []),
+        "bio_links": ", ".join(record.get("bio_links") or []),
+        "create_time": record.get("create_time"),
+        "duration": record.get("duration"),
+        "snapshot_at": record.get("snapshot_at"),
+    }
+
+
+def read_csv_header(path, delimiter=";"):
+    # kolomnamen zijn ASCII, dus de encoding van het bestand maakt niet uit
+    with open(path, "rb") as f:
+        line = f.readline().decode("utf-8-sig", errors="replace")
+    return next(csv.reader([line], delimiter=delimiter), [])
+
+
+class CsvSink:
+    def __init__(self, path, delimiter=";", encoding=CSV_ENCODING):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        if not new_file:
+            # appenden aan een CSV met andere kolommen (bv. oude output zonder
+            # snapshot_at) zou alle kolommen ongemerkt verschuiven
+            header = read_csv_header(self.path, delimiter)
+            if header != CSV_COLUMNS:
+                raise ValueError(
+                    f"Cannot append to {self.path}: columns {header} do not match {CSV_COLUMNS}; "
+                    f"use a new output file"
+                )
+
+        # bij append naar een bestaand bestand schrijft utf-8-sig geen tweede BOM
+        self._f = open(self.path, "a", encoding=encoding, newline="")
+        self._writer = csv.DictWriter(self._f, fieldnames=CSV_COLUMNS, delimiter=delimiter)
+        if new_file:
+            self._writer.writeheader()
+            self._f.flush()
+        self.count = 0
+
+    def write(self, record):
+        self._writer.writerow(flatten_record(record))
+        self._f.flush()
+        self.count += 1
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -----------------------------
+# Columnar sinks (Parquet / Arrow)
+# -----------------------------
+# Getypte kolommen: video_id als string, tellers als int64, hashtags en
+# bio_links als list<string> en profile_stats als struct. Records worden per
+# row group weggeschreven terwijl de scrape loopt.
+SUFFIX_MULTIPLIERS = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+
+
+def _to_int(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str):
+        # ook DOM tellers als "79.2K" / "1.3M"
+        v = value.strip().upper().replace(",", "")
+        if v.lstrip("-").isdigit():
+            return int(v)
+        mult = SUFFIX_MULTIPLIERS.get(v[-1:], 1)
+        if mult != 1:
+            v = v[:-1]
+        try:
+            return int(float(v) * mult)
+        except ValueError:
+            return None
+    return None
+
+
+def arrow_schema():
+    return pa.schema([
+        ("keyword", pa.string()),
+        ("video_id", pa.string()),
+        ("video_url", pa.string()),
+        ("desc", pa.string()),
+        ("views", pa.int64()),
+        ("likes", pa.int64()),
+        ("comments", pa.int64()),
+        ("shares", pa.int64()),
+        ("saves", pa.int64()),
+        ("author", pa.string()),
+        ("profile_bio", pa.string()),
+        ("bio_links", pa.list_(pa.string())),
+        ("profile_stats", pa.struct([
+            ("nickname", pa.string()),
+            ("verified", pa.bool_()),
+            ("followers", pa.int64()),
+            ("following", pa.int64()),
+            ("likes", pa.int64()),
+            ("videos", pa.int64()),
+        ])),
+        ("hashtags", pa.list_(pa.string())),
+        ("create_time", pa.int64()),
+        ("duration", pa.int64()),
+        ("snapshot_at", pa.int64()),
+    ])
+
+
+def typed_record(record):
+    stats = record.get("profile_stats") or {}
+    return {
+        "keyword": record.get("keyword"),
+        "video_id": str(record["video_id"]) if record.get("video_id") is not None else None,
+        "video_url": record.get("video_url"),
+        "desc": record.get("desc"),
+        "views": _to_int(record.get("views")),
+        "likes": _to_int(record.get("likes")),
+        "comments": _to_int(record.get("comments")),
+        "shares": _to_int(record.get("shares")),
+        "saves": _to_int(record.get("saves")),
+        "author": record.get("author"),
+        "profile_bio": record.get("profile_bio"),
+        "bio_links": list(record.get("bio_links") or []),
+        "profile_stats": {
+            "nickname": stats.get("nickname"),
+            "verified": stats.get("verified"),
+            "followers": _to_int(stats.get("followers")),
+            "following": _to_int(stats.get("following")),
+            "likes": _to_int(stats.get("likes")),
+            "videos": _to_int(stats.get("videos")),
+        } if stats else None,
+        "hashtags": list(record.get("hashtags") or []),
+        "create_time": _to_int(record.get("create_time")),
+        "duration": _to_int(record.get("duration")),
+        "snapshot_at": _to_int(record.get("snapshot_at")),
+    }
+
+
+class _ColumnarSink:
+    def __init__(self, path, row_group_size=100):
+        if pa is None:
+            raise RuntimeError("pyarrow is required for Parquet/Arrow output (pip install pyarrow)")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.schema = arrow_schema()
+        self.row_group_size = row_group_size
+        self._rows = []
+        self._writer = None
+        self.count = 0
+
+    def _open_writer(self):
+        raise NotImplementedError
+
+    def write(self, record):
+        self._rows.append(typed_record(record))
+        self.count += 1
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        if self._writer is None:
+            self._writer = self._open_writer()
+        self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self.schema))
+        self._rows = []
+
+    def close(self):
+        self.flush()
+        if self._writer is None:
+            # lege run: toch een geldig bestand met schema wegschrijven
+            self._writer = self._open_writer()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetSink(_ColumnarSink):
+    def _open_writer(self):
+        return pq.ParquetWriter(self.path, self.schema, compression="zstd")
+
+
+class ArrowSink(_ColumnarSink):
+    def _open_writer(self):
+        return pa.ipc.new_file(self.path, self.schema)
+
+
+def open_sink(path):
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return CsvSink(path)
+    if suffix in (".jsonl", ".ndjson"):
+        return JsonlSink(path)
+    if suffix == ".parquet":
+        return ParquetSink(path)
+    if suffix in (".arrow", ".feather"):
+        return ArrowSink(path)
+    raise ValueError(f"Unknown output format: {path}")
@@ -0,0 +1,12 @@
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# scraper.search zet bij import de logger op; logs niet in de repo laten landen
+import logger  # noqa: E402
+
+logger.LOG_DIR = Path(tempfile.mkdtemp(prefix="scraper-test-logs-"))
+logger.LOG_FILE = logger.LOG_DIR / "scraper.log"
+logger.EVENTS_FILE = logger.LOG_DIR / "scraper.jsonl"
@@ -0,0 +1,50 @@
+import asyncio
+
+from scraper.adaptive import AdaptiveLimiter, fetch_timer
+
+
+async def fetch(limiter, delay=0.001, error=None):
+    async with limiter:
+        with fetch_timer():
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+
+
+async def run_batch(limiter, n, **kwargs):
+    await asyncio.gather(*(fetch(limiter, **kwargs) for _ in range(n)), return_exceptions=True)
+
+
+def test_healthy_saturated_window_increases_limit():
+    async def run():
+        limiter = AdaptiveLimiter(initial=2, max_limit=4, window=4)
+        await run_batch(limiter, 4)
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.limit == 3
+    assert limiter.history[-1][2] == "healthy"
+
+
+def test_errors_decrease_limit():
+    async def run():
+        limiter = AdaptiveLimiter(initial=4, max_limit=8, window=4)
+        await run_batch(limiter, 4, error=TimeoutError("timeout"))
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.limit == 2
+    assert limiter.history[-1][2].startswith("errors=")
+
+
+def test_slots_without_fetch_give_no_samples():
+    async def run():
+        limiter = AdaptiveLimiter(initial=2, max_limit=4, window=4)
+        for _ in range(8):
+            async with limiter:
+                pass  # cache hit: geen fetch_timer
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.limit == 2
+    assert limiter.baseline_ms is None
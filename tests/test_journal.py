@@ -0,0 +1,48 @@
+from scraper.journal import CrawlJournal
+from scraper.search import load_journal_state
+
+
+def make_items(n):
+    return [{"idx": i, "href": f"/video/{i}", "video_id": str(i), "desc": "", "username": "u"} for i in range(n)]
+
+
+def make_journal(tmp_path, done=(1, 3)):
+    journal = CrawlJournal(tmp_path / "crawl.sqlite")
+    journal.save_items("kat", make_items(5))
+    for i in done:
+        journal.mark_done("kat", str(i), {"video_id": str(i), "keyword": "kat"})
+    journal.mark_failed("kat", "2", "boom")
+    return journal
+
+
+def test_no_journal_discovers():
+    assert load_journal_state(None, "kat") == (None, {})
+
+
+def test_unfinished_keyword_resumes(tmp_path):
+    journal = make_journal(tmp_path)
+    items, done = load_journal_state(journal, "kat")
+    assert [it["video_id"] for it in items] == ["0", "1", "2", "3", "4"]
+    assert list(done) == ["1", "3"]
+    assert done["3"]["keyword"] == "kat"
+
+
+def test_completed_keyword_is_reset(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.mark_complete("kat")
+    assert load_journal_state(journal, "kat") == (None, {})
+    assert journal.get_items("kat") is None
+
+
+def test_resume_true_resumes_completed_keyword(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.mark_complete("kat")
+    items, done = load_journal_state(journal, "kat", resume=True)
+    assert len(items) == 5
+    assert list(done) == ["1", "3"]
+
+
+def test_resume_false_resets(tmp_path):
+    journal = make_journal(tmp_path)
+    assert load_journal_state(journal, "kat", resume=False) == (None, {})
+    assert journal.done_records("kat") == {}
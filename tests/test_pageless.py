@@ -0,0 +1,28 @@
+import pytest
+
+from scraper.pageless import RehydrationScanner, extract_rehydration_raw
+
+PAYLOAD = b'{"__DEFAULT_SCOPE__": {"desc": "caf\xc3\xa9 <b>"}}'
+HTML = (
+    b"<html><head>" + b"<meta name='x'>" * 50
+    + b'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+    + PAYLOAD
+    + b"</script><script>var later = 1;</script></head></html>"
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 9, 16, 64, len(HTML)])
+def test_scanner_across_chunk_boundaries(chunk_size):
+    assert extract_rehydration_raw(HTML, chunk_size) == PAYLOAD
+
+
+def test_scanner_stops_after_closing_tag():
+    scanner = RehydrationScanner()
+    assert not scanner.feed(HTML[:100])
+    assert scanner.feed(HTML[100:])
+    assert scanner.feed(b"<script>ignored</script>")
+    assert scanner.result() == PAYLOAD
+
+
+def test_scanner_without_script():
+    assert extract_rehydration_raw(b"<html><body>geen data</body></html>", 8) is None
@@ -0,0 +1,44 @@
+import asyncio
+
+import scraper.search as search
+
+
+def make_items(n):
+    return [{"idx": i, "href": f"/video/{i}", "video_id": str(i), "desc": "", "username": "u"} for i in range(n)]
+
+
+def collect(items, concurrency, done=None):
+    async def run():
+        return [r async for r in search.iter_video_records(None, "kat", items, concurrency, done=done)]
+    return asyncio.run(run())
+
+
+def test_records_in_idx_order_with_failing_item(monkeypatch):
+    monkeypatch.setattr(search, "PAGE_POOL_SIZE", None)
+
+    async def process(context, keyword, item, cache=None):
+        # latere items zijn sneller klaar, item 2 faalt
+        await asyncio.sleep(0.002 * (10 - item["idx"]))
+        if item["idx"] == 2:
+            raise RuntimeError("boom")
+        return {"video_id": item["video_id"], "keyword": keyword}
+
+    monkeypatch.setattr(search, "process_video_item", process)
+    records = collect(make_items(10), concurrency=4)
+    assert [r["video_id"] for r in records] == [str(i) for i in range(10) if i != 2]
+
+
+def test_done_records_fill_their_idx_slot(monkeypatch):
+    monkeypatch.setattr(search, "PAGE_POOL_SIZE", None)
+    fetched = []
+
+    async def process(context, keyword, item, cache=None):
+        fetched.append(item["video_id"])
+        return {"video_id": item["video_id"]}
+
+    monkeypatch.setattr(search, "process_video_item", process)
+    done = {"1": {"video_id": "1", "replayed": True}, "3": {"video_id": "3", "replayed": True}}
+    records = collect(make_items(5), concurrency=2, done=done)
+    assert [r["video_id"] for r in records] == ["0", "1", "2", "3", "4"]
+    assert records[1] is done["1"]
+    assert sorted(fetched) == ["0", "2", "4"]